@@ -194,6 +194,8 @@ class GrokProvider(BaseProvider):
             self._mcp_adapter = None
         
         self._client = None
+        if self._tool_executor:
+            self._tool_executor.close()
         self._tool_executor = None
         self._messages = []
         self._browser_available = False
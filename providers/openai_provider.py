@@ -24,7 +24,7 @@ from .base import (
     ToolResultBlock,
 )
 from tools.executor import ToolExecutor
-from tools.sdk_tools import SDK_TOOLS, set_executor
+from tools.sdk_tools import get_sdk_tools, set_executor
 
 
 # System prompt for coding tasks
@@ -131,16 +131,17 @@ class OpenAIProvider(BaseProvider):
                 self._browser_available = False
         
         # Create agent with tools and MCP servers
+        sdk_tools = get_sdk_tools()
         self._agent = Agent(
             name="Coding Assistant",
             instructions=SYSTEM_PROMPT,
-            tools=SDK_TOOLS,
+            tools=sdk_tools,
             mcp_servers=mcp_servers,
             model=self.model,
         )
         
         # Count tools
-        tool_count = len(SDK_TOOLS)
+        tool_count = len(sdk_tools)
         if self._browser_available and self._mcp_server:
             # Tools will be discovered automatically by SDK
             # Rough estimate: add 8 for typical browser tools
@@ -169,6 +170,8 @@ class OpenAIProvider(BaseProvider):
             self._mcp_server = None
         
         self._agent = None
+        if self._tool_executor:
+            self._tool_executor.close()
         self._tool_executor = None
         self._browser_available = False
     
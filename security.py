@@ -6,7 +6,9 @@ Pre-tool-use hooks that validate bash commands for security.
 Uses an allowlist approach - only explicitly permitted commands can run.
 """
 
+import functools
 import os
+import re
 import shlex
 
 
@@ -48,6 +50,17 @@ ALLOWED_COMMANDS = {
 # Commands that need additional validation even when in the allowlist
 COMMANDS_NEEDING_EXTRA_VALIDATION = {"pkill", "chmod", "init.sh"}
 
+# Patterns used on every validation, compiled once at import
+_CHAIN_SPLIT_RE = re.compile(r"\s*(?:&&|\|\|)\s*")
+_SEMICOLON_SPLIT_RE = re.compile(r'(?<!["\'])\s*;\s*(?!["\'])')
+_CHMOD_EXEC_MODE_RE = re.compile(r"^[ugoa]*\+x$")
+
+# Shell keywords that can precede a command name
+_SHELL_KEYWORDS = frozenset({
+    "if", "then", "else", "elif", "fi", "for", "while", "until",
+    "do", "done", "case", "esac", "in", "!", "{", "}",
+})
+
 
 def split_command_segments(command_string: str) -> list[str]:
     """
@@ -61,16 +74,14 @@ def split_command_segments(command_string: str) -> list[str]:
     Returns:
         List of individual command segments
     """
-    import re
-
     # Split on && and || while preserving the ability to handle each segment
     # This regex splits on && or || that aren't inside quotes
-    segments = re.split(r"\s*(?:&&|\|\|)\s*", command_string)
+    segments = _CHAIN_SPLIT_RE.split(command_string)
 
     # Further split on semicolons
     result = []
     for segment in segments:
-        sub_segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', segment)
+        sub_segments = _SEMICOLON_SPLIT_RE.split(segment)
         for sub in sub_segments:
             sub = sub.strip()
             if sub:
@@ -95,11 +106,9 @@ def extract_commands(command_string: str) -> list[str]:
     commands = []
 
     # shlex doesn't treat ; as a separator, so we need to pre-process
-    import re
-
     # Split on semicolons that aren't inside quotes (simple heuristic)
     # This handles common cases like "echo hello; ls"
-    segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', command_string)
+    segments = _SEMICOLON_SPLIT_RE.split(command_string)
 
     for segment in segments:
         segment = segment.strip()
@@ -126,24 +135,7 @@ def extract_commands(command_string: str) -> list[str]:
                 continue
 
             # Skip shell keywords that precede commands
-            if token in (
-                "if",
-                "then",
-                "else",
-                "elif",
-                "fi",
-                "for",
-                "while",
-                "until",
-                "do",
-                "done",
-                "case",
-                "esac",
-                "in",
-                "!",
-                "{",
-                "}",
-            ):
+            if token in _SHELL_KEYWORDS:
                 continue
 
             # Skip flags/options
@@ -248,9 +240,7 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
 
     # Only allow +x variants (making files executable)
     # This matches: +x, u+x, g+x, o+x, a+x, ug+x, etc.
-    import re
-
-    if not re.match(r"^[ugoa]*\+x$", mode):
+    if not _CHMOD_EXEC_MODE_RE.match(mode):
         return False, f"chmod only allowed with +x mode, got: {mode}"
 
     return True, ""
@@ -299,12 +289,15 @@ def get_command_for_validation(cmd: str, segments: list[str]) -> str:
     return ""
 
 
+@functools.lru_cache(maxsize=256)
 def validate_bash_command(command: str) -> tuple[bool, str]:
     """
     Validate a bash command against the security allowlist.
     
     This is a synchronous version for use by non-Claude providers
-    that don't use the hook system.
+    that don't use the hook system. Agents repeat the same commands
+    (git status, npm test) often, so verdicts are cached per command
+    string; the allowlist is fixed at import, so they never go stale.
     
     Args:
         command: The bash command to validate
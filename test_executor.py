@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Tool Executor Tests
+===================
+
+Tests for the sandboxed file, search and bash tools in tools/executor.py.
+Run with: python -m pytest test_executor.py
+"""
+
+import glob
+import os
+import random
+import sys
+import time
+
+import pytest
+
+import tools.executor
+from tools.executor import ToolExecutor, _compile_glob, _split_simple_command
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """A ToolExecutor sandboxed to a fresh temporary project directory."""
+    tool_executor = ToolExecutor(tmp_path)
+    tool_executor._rg_path = None  # exercise the Python search fallback
+    yield tool_executor
+    tool_executor.close()
+
+
+def test_bash_runs_script_without_shebang(executor, tmp_path):
+    """exec() rejects a shebang-less script (ENOEXEC); /bin/sh must run it."""
+    script = tmp_path / "init.sh"
+    script.write_text("echo initialized\n")
+    os.chmod(script, 0o755)
+
+    result = executor.execute("bash", {"command": "./init.sh"})
+
+    assert result == {"result": "initialized\n"}
+
+
+@pytest.mark.parametrize("data", [
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + b"\x00" * 60 + b"IEND\xaeB`\x82",
+    "café IEND".encode("latin-1"),
+])
+def test_edit_file_rejects_small_binary_files(executor, tmp_path, data):
+    """Files under the sniff size are still checked before editing."""
+    target = tmp_path / "image.png"
+    target.write_bytes(data)
+
+    result = executor.execute("edit_file", {
+        "path": "image.png",
+        "old_string": "IEND",
+        "new_string": "XXXX",
+    })
+
+    assert result == {"error": "Cannot edit binary file: image.png"}
+    assert target.read_bytes() == data
+
+
+@pytest.mark.parametrize("data", [
+    b"one\rtwo\rthree",
+    b"one\r\ntwo\r\nthree\r\n",
+    b"one\x0ctwo\nthree\n",
+    "one\u2028two\nthree".encode("utf-8"),
+    b"one\n\rtwo\r\r\nthree\r",
+])
+def test_paginated_read_splits_lines_like_full_read(executor, tmp_path, data):
+    """Paginated windows use the same line breaks as splitting the full read."""
+    (tmp_path / "lines.txt").write_bytes(data)
+    full = executor.execute("read_file", {"path": "lines.txt"})["result"]
+    lines = full.splitlines()
+    total = len(lines)
+
+    page = executor.execute("read_file", {"path": "lines.txt", "offset": 0})
+    assert page == {"result": f"[lines 1-{total} of {total}]\n" + "\n".join(lines)}
+
+    for offset, line in enumerate(lines):
+        page = executor.execute(
+            "read_file", {"path": "lines.txt", "offset": offset, "limit": 1}
+        )
+        assert page == {"result": f"[lines {offset + 1}-{offset + 1} of {total}]\n{line}"}
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_paginated_read_matches_full_read_randomized(executor, tmp_path, monkeypatch, use_mmap):
+    """Random windows over random text agree with the split full read."""
+    if use_mmap:
+        monkeypatch.setattr(tools.executor, "_MMAP_THRESHOLD", 0)
+    rng = random.Random(1234)
+    pieces = ["a", "bc", "é", "\n", "\n", "\r\n", "\r", "\x0c", "\u2028"]
+    for round_index in range(50):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randrange(1, 60)))
+        # Mostly LF/CRLF files, which take the byte-offset path
+        if round_index % 2:
+            text = text.replace("\r\n", "\n").replace("\r", "").replace("\x0c", "")
+            text = text.replace("\u2028", "")
+        (tmp_path / "random.txt").write_bytes(text.encode("utf-8"))
+        full = executor.execute("read_file", {"path": "random.txt"})["result"]
+        lines = full.splitlines()
+        if not lines:
+            continue
+
+        offset = rng.randrange(len(lines))
+        limit = rng.randrange(1, len(lines) + 2)
+        page = executor.execute(
+            "read_file", {"path": "random.txt", "offset": offset, "limit": limit}
+        )
+
+        end = min(offset + limit, len(lines))
+        header = f"[lines {offset + 1}-{end} of {len(lines)}]\n"
+        assert page == {"result": header + "\n".join(lines[offset:end])}, repr(text)
+
+
+@pytest.mark.parametrize("pattern", ["^", "x*", "$"])
+@pytest.mark.parametrize("multiline", [False, True])
+def test_grep_count_has_no_line_after_final_newline(executor, tmp_path, pattern, multiline):
+    """Patterns matching empty at EOF count the file's lines, as rg does."""
+    (tmp_path / "a.txt").write_text("one\ntwo\nthree\n")
+
+    result = executor.execute("grep_search", {
+        "pattern": pattern,
+        "output_mode": "count",
+        "multiline": multiline,
+    })
+
+    assert result == {"result": "./a.txt:3"}
+
+
+@pytest.fixture
+def search_project(tmp_path):
+    """A small tree for grep_search, mirroring rg's output format."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text(
+        "import os\nimport sys\n\ndef main():\n    print('hi')\n"
+    )
+    (tmp_path / "src" / "b.py").write_text("print('b')\n")
+    (tmp_path / "notes.txt").write_text("Nothing here\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.py").write_text("print('dep')\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("arguments, expected", [
+    # rg -l: one path per file, as given under the search path
+    ({"pattern": "print"}, "./src/a.py\n./src/b.py"),
+    ({"pattern": "print", "path": "src"}, "src/a.py\nsrc/b.py"),
+    ({"pattern": "print", "path": "src/b.py"}, "src/b.py"),
+    # rg -c: path:count for files with matches; a bare count for one file
+    ({"pattern": "import", "output_mode": "count"}, "./src/a.py:2"),
+    ({"pattern": "import", "path": "src/a.py", "output_mode": "count"}, "2"),
+    # rg -n: path:line:text, no path when searching a single file
+    (
+        {"pattern": "print", "output_mode": "content"},
+        "./src/a.py:5:    print('hi')\n./src/b.py:1:print('b')",
+    ),
+    (
+        {"pattern": "import", "path": "src/a.py", "output_mode": "content"},
+        "1:import os\n2:import sys",
+    ),
+    (
+        {"pattern": "print", "path": "src", "output_mode": "content", "-n": False},
+        "src/a.py:    print('hi')\nsrc/b.py:print('b')",
+    ),
+    # Context lines use '-', with '--' between groups and between files
+    (
+        {"pattern": "def", "path": "src", "output_mode": "content", "-C": 1},
+        "src/a.py-3-\nsrc/a.py:4:def main():\nsrc/a.py-5-    print('hi')",
+    ),
+    (
+        {"pattern": "os$|print", "path": "src", "output_mode": "content", "-C": 1},
+        "src/a.py:1:import os\n"
+        "src/a.py-2-import sys\n"
+        "--\n"
+        "src/a.py-4-def main():\n"
+        "src/a.py:5:    print('hi')\n"
+        "--\n"
+        "src/b.py:1:print('b')",
+    ),
+    (
+        {"pattern": "sys", "path": "src/a.py", "output_mode": "content", "-B": 1, "-n": False},
+        "import os\nimport sys",
+    ),
+    # --glob filters, including negation; -i
+    ({"pattern": "here", "glob": "*.txt"}, "./notes.txt"),
+    ({"pattern": "i", "glob": "!*.py"}, "./notes.txt"),
+    ({"pattern": "nothing"}, "No matches found"),
+    ({"pattern": "nothing", "-i": True}, "./notes.txt"),
+    # head_limit / offset slice the output lines
+    ({"pattern": "print", "head_limit": 1}, "./src/a.py\n... (results truncated)"),
+    ({"pattern": "print", "offset": 1}, "./src/b.py"),
+])
+def test_grep_fallback_matches_rg_format(search_project, executor, arguments, expected):
+    assert executor.execute("grep_search", arguments) == {"result": expected}
+
+
+def test_grep_fallback_reports_invalid_regex(search_project, executor):
+    result = executor.execute("grep_search", {"pattern": "("})
+    assert result["error"].startswith("regex parse error")
+
+
+@pytest.fixture
+def glob_tree(tmp_path):
+    """Files and directories (hidden, nested, empty) for glob matching."""
+    for rel in [
+        "a.py", "b.txt", "src/a.py", "src/b.py", "src/c.txt",
+        "src/deep/x.py", "src/deep/more/y.py", "sbc/a.py",
+        ".hidden/h.py", "src/.env", "docs/readme.md",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x\n")
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+@pytest.mark.parametrize("pattern", [
+    "*", "*.py", "src/*", "src/*.py", "**", "**/*.py", "src/**", "src/**/*.py",
+    "*/**/*.py", "s?c/*.py", "src/[ab].py", "src/[!a]*", "**/.env",
+    ".hidden/*", "src/.*", "**/deep/*", "no/such/*",
+    "**/**", "src/**/**", "**/**/*.py", "*/**", "src/*.py/**", "**/deep/**",
+])
+def test_compile_glob_matches_glob_module(glob_tree, pattern):
+    """_compile_glob follows glob.glob(recursive=True) semantics."""
+    all_paths = []
+    for root, dirs, files in os.walk(glob_tree):
+        rel_root = os.path.relpath(root, glob_tree)
+        for name in [f"{name}/" for name in dirs] + files:
+            all_paths.append(name if rel_root == "." else f"{rel_root}/{name}")
+    regex = _compile_glob(pattern)
+
+    # Directories are matched with a trailing '/'
+    matched = sorted(
+        path.rstrip("/") for path in all_paths if regex.fullmatch(path)
+    )
+    expected = sorted(set(
+        path.rstrip("/")
+        for path in glob.glob(pattern, root_dir=glob_tree, recursive=True)
+    ))
+
+    assert matched == expected
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("ls -la", ["ls", "-la"]),
+    ("git commit -m 'two words'", ["git", "commit", "-m", "two words"]),
+    ('echo "quoted"', ["echo", "quoted"]),
+    ("npm run build && npm test", None),
+    ("cat a.txt | wc -l", None),
+    ("echo $HOME", None),
+    ("ls *.py", None),
+    ("echo hi > out.txt", None),
+    ("FOO=1 npm test", None),
+    ("ls ~", None),
+    ("sleep 1; ls", None),
+    ("git log # comment", None),
+    ("echo 'unterminated", None),
+    ("   ", None),
+])
+def test_split_simple_command(command, expected):
+    """Only commands free of shell syntax are exec'd without /bin/sh."""
+    assert _split_simple_command(command) == expected
+
+
+def test_bash_direct_exec_and_shell_paths(executor, tmp_path):
+    (tmp_path / "one.txt").write_text("1\n")
+
+    assert executor.execute("bash", {"command": "echo hello"}) == {"result": "hello\n"}
+    # Needs the shell for glob expansion and the pipe
+    assert executor.execute("bash", {"command": "ls *.txt | wc -l"})["result"].strip() == "1"
+    failed = executor.execute("bash", {"command": "ls missing-file"})["result"]
+    assert "[stderr]:" in failed
+    assert failed.endswith("[exit code: 2]")
+    assert executor.execute("bash", {"command": "true"}) == {"result": "(no output)"}
+
+
+def test_command_output_uses_universal_newlines(executor, tmp_path):
+    """CRLF and lone CR in bash and rg output read as LF, as text pipes did."""
+    (tmp_path / "crlf.txt").write_bytes(b"one\r\ntwo\r\n")
+    (tmp_path / "progress.txt").write_bytes(b"10%\r50%\r")
+
+    assert executor.execute("bash", {"command": "cat crlf.txt"}) == {
+        "result": "one\ntwo\n"
+    }
+    assert executor.execute("bash", {"command": "cat progress.txt | cat"}) == {
+        "result": "10%\n50%\n"
+    }
+
+    script = "import sys; sys.stdout.write('a:1\\r\\nb:2\\rc:3\\n')"
+    assert executor._stream_rg([sys.executable, "-c", script], None) == (
+        0, ["a:1", "b:2", "c:3"], "", True
+    )
+
+
+def test_edit_file_replacements(executor, tmp_path):
+    target = tmp_path / "app.py"
+    target.write_text("x = 1\ny = 1\nz = 1\n")
+
+    assert executor.execute("edit_file", {
+        "path": "app.py", "old_string": "= 1", "new_string": "= 2",
+    }) == {"result": "Replaced 1 occurrence(s) in app.py"}
+    assert target.read_text() == "x = 2\ny = 1\nz = 1\n"
+
+    assert executor.execute("edit_file", {
+        "path": "app.py", "old_string": "= 1", "new_string": "= 3", "replace_all": True,
+    }) == {"result": "Replaced 2 occurrence(s) in app.py"}
+    assert target.read_text() == "x = 2\ny = 3\nz = 3\n"
+
+    assert executor.execute("edit_file", {
+        "path": "app.py", "old_string": "missing", "new_string": "",
+    }) == {"error": "String not found in file: missing"}
+    assert executor.execute("edit_file", {
+        "path": "nope.py", "old_string": "a", "new_string": "b",
+    }) == {"error": "File not found: nope.py"}
+
+
+def test_edit_file_utf8_and_crlf(executor, tmp_path):
+    target = tmp_path / "notes.txt"
+    target.write_bytes("café\r\nnaïve\r\n".encode("utf-8"))
+
+    # A multi-line old_string written with LF still matches CRLF text
+    result = executor.execute("edit_file", {
+        "path": "notes.txt", "old_string": "café\nnaïve", "new_string": "tea\ncake",
+    })
+
+    assert result == {"result": "Replaced 1 occurrence(s) in notes.txt"}
+    assert executor.execute("read_file", {"path": "notes.txt"}) == {"result": "tea\ncake\n"}
+
+    executor.execute("edit_file", {
+        "path": "notes.txt", "old_string": "cake", "new_string": "gâteau",
+    })
+    assert target.read_text(encoding="utf-8") == "tea\ngâteau\n"
+
+
+@pytest.mark.parametrize("data, replace_all, expected", [
+    (b"x\ny\nx\r\ny\n", True, ("Replaced 2", "z\nz\n")),
+    (b"x\r\ny\nx\ny\n", False, ("Replaced 1", "z\nx\ny\n")),
+])
+def test_edit_file_mixed_line_endings(executor, tmp_path, data, replace_all, expected):
+    """CRLF and LF occurrences of a multi-line old_string both match, in order."""
+    (tmp_path / "mixed.txt").write_bytes(data)
+
+    result = executor.execute("edit_file", {
+        "path": "mixed.txt", "old_string": "x\ny", "new_string": "z",
+        "replace_all": replace_all,
+    })
+
+    message, content = expected
+    assert result == {"result": f"{message} occurrence(s) in mixed.txt"}
+    assert (tmp_path / "mixed.txt").read_text() == content
+
+
+def test_read_cache_sees_edits_and_external_writes(executor, tmp_path):
+    target = tmp_path / "a.txt"
+    target.write_text("one\n")
+    assert executor.execute("read_file", {"path": "a.txt"}) == {"result": "one\n"}
+
+    executor.execute("edit_file", {"path": "a.txt", "old_string": "one", "new_string": "two"})
+    assert executor.execute("read_file", {"path": "a.txt"}) == {"result": "two\n"}
+
+    target.write_text("three, longer\n")  # outside the executor
+    assert executor.execute("read_file", {"path": "a.txt"}) == {"result": "three, longer\n"}
+
+
+def test_search_caches_are_dropped_by_mutating_tools(executor, tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("needle\n")
+
+    assert executor.execute("grep_search", {"pattern": "needle"}) == {"result": "./src/a.py"}
+    assert executor.execute("glob_search", {"pattern": "src/*.py"}) == {"result": "src/a.py"}
+
+    executor.execute("write_file", {"path": "src/b.py", "content": "needle\n"})
+    assert executor.execute("grep_search", {"pattern": "needle"}) == {
+        "result": "./src/a.py\n./src/b.py"
+    }
+    assert executor.execute("glob_search", {"pattern": "src/*.py"}) == {
+        "result": "src/a.py\nsrc/b.py"
+    }
+
+    executor.execute("bash", {"command": "cp src/a.py src/c.py"})
+    assert executor.execute("glob_search", {"pattern": "src/*.py"}) == {
+        "result": "src/a.py\nsrc/b.py\nsrc/c.py"
+    }
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("*", "app.py\nbuild\nsrc"),
+    ("*/", "build\nsrc"),
+    ("**", "app.py\nbuild\nsrc\nsrc/main.py\nsrc/node_modules"),
+    ("**/*.py", "app.py\nsrc/main.py"),
+    ("build/**/*.py", "build/lib/gen.py"),
+    ("**/node_modules/*", "src/node_modules/dep.js"),
+    (".*", ".env\n.git"),
+    ("**/.git/*", ".git/HEAD"),
+])
+def test_glob_search_skips_hidden_and_dependency_dirs(executor, tmp_path, pattern, expected):
+    """Hidden entries are skipped, and _WALK_PRUNE_DIRS listed but not searched,
+    unless the pattern names them."""
+    for rel in [
+        "app.py", "src/main.py", "build/lib/gen.py",
+        "src/node_modules/dep.js", ".env", ".git/HEAD",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x\n")
+
+    assert executor.execute("glob_search", {"pattern": pattern}) == {"result": expected}
+
+
+def fake_rg_files(root, calls):
+    """Stand-in for ToolExecutor._run_rg answering ``rg --files`` from disk."""
+    def run_rg(args, max_lines=None):
+        calls.append(args)
+        assert args[:2] == ["--files", "--no-ignore"]
+        excluded = {arg[1:-1] for arg in args if arg.startswith("!")}
+        paths = [arg for arg in args[2:] if not arg.startswith(("-", "!"))]
+        search = paths[0] if paths else ""
+        lines = []
+        for dir_path, dirs, files in os.walk(root / search):
+            dirs[:] = [
+                name for name in dirs
+                if name not in excluded
+                and ("--hidden" in args or not name.startswith("."))
+            ]
+            rel_dir = os.path.relpath(dir_path, root)
+            for name in files:
+                if "--hidden" in args or not name.startswith("."):
+                    lines.append(name if rel_dir == "." else f"{rel_dir}/{name}")
+        return (0 if lines else 1), lines, ""
+    return run_rg
+
+
+@pytest.mark.parametrize("pattern, path", [
+    ("*", None), ("*/", None), ("**", None), ("**/", None), ("**/*.py", None),
+    ("gen*/**", None), ("*/**/", None), ("build/**/*.py", None), (".*/**", None),
+    ("**", "src"), ("*", "src"), ("**/*.py", "src"), ("**/*.py/", None),
+    ("**/b*", None), ("**/lib/*", None),
+])
+def test_glob_search_rg_matches_walk(executor, tmp_path, monkeypatch, pattern, path):
+    """The rg --files path and the Python walk list the same entries."""
+    for rel in [
+        "app.py", "src/main.py", "src/pkg/deep/mod.py", "build/lib/gen.py",
+        "generations/run1/logs/out.txt", ".cache/x/y.py",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x\n")
+    arguments = {"pattern": pattern, "path": path} if path else {"pattern": pattern}
+    walked = executor.execute("glob_search", arguments)
+
+    calls = []
+    executor._glob_cache.clear()
+    executor._rg_path = "rg"
+    monkeypatch.setattr(executor, "_run_rg", fake_rg_files(tmp_path, calls))
+
+    assert executor.execute("glob_search", arguments) == walked
+
+    base_dir = tmp_path / path if path else tmp_path
+    prefix = f"{path}/" if path else ""
+    rg_entries = executor._rg_glob(pattern, base_dir, prefix)
+    if rg_entries is not None:
+        assert calls
+        assert sorted(rg_entries) == sorted(executor._walk_glob(pattern, base_dir))
+
+
+def test_glob_search_description_lists_skipped_dirs():
+    from tools.definitions import TOOL_DEFINITIONS
+    from tools.sdk_tools import glob_search
+
+    description = next(
+        tool["function"]["description"]
+        for tool in TOOL_DEFINITIONS
+        if tool["function"]["name"] == "glob_search"
+    )
+    for name in tools.executor._WALK_PRUNE_DIRS:
+        assert name in description
+        assert name in glob_search.__doc__
+
+
+def test_search_cache_sees_external_changes(executor, tmp_path, monkeypatch):
+    monkeypatch.setattr(tools.executor, "_SEARCH_CACHE_TTL", 0.2)
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "a.py").write_text("x\n")
+    assert executor.execute("glob_search", {"pattern": "src/**/*.py"}) == {
+        "result": "src/pkg/a.py"
+    }
+
+    # Added by another process below the searched directory
+    (tmp_path / "src" / "pkg" / "b.py").write_text("x\n")
+    time.sleep(0.25)
+    assert executor.execute("glob_search", {"pattern": "src/**/*.py"}) == {
+        "result": "src/pkg/a.py\nsrc/pkg/b.py"
+    }
+
+    # A change directly in the searched directory shows up at once
+    (tmp_path / "src" / "c.py").write_text("x\n")
+    assert executor.execute("glob_search", {"pattern": "*.py", "path": "src"}) == {
+        "result": "src/c.py"
+    }
+    (tmp_path / "src" / "d.py").write_text("x\n")
+    assert executor.execute("glob_search", {"pattern": "*.py", "path": "src"}) == {
+        "result": "src/c.py\nsrc/d.py"
+    }
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+MCP Adapter Tests
+=================
+
+Tests for tools/mcp_adapter.py against a fake MCP server speaking JSON-RPC
+over stdio.
+Run with: python -m pytest test_mcp_adapter.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+import tools.executor
+from tools.executor import ToolExecutor
+from tools.mcp_adapter import MCPAdapter, MCPError
+
+
+# Answers each request on its own thread, so slow calls overlap. Tools:
+# echo (default), sleep, image, fail, big, noisy, die, ask (sends a
+# roots/list request reusing the call's id first); any call with a "delay"
+# argument waits that long first
+FAKE_SERVER = r'''
+import base64, json, os, sys, threading, time
+
+write_lock = threading.Lock()
+
+def send(message):
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+def reply(message_id, result=None, error=None):
+    message = {"jsonrpc": "2.0", "id": message_id}
+    if error is not None:
+        message["error"] = error
+    else:
+        message["result"] = result
+    send(message)
+
+def handle(message):
+    method, params = message["method"], message.get("params", {})
+    if method == "initialize":
+        return reply(message["id"], {"protocolVersion": params["protocolVersion"]})
+    if method == "ping":
+        return reply(message["id"], {})
+    if method == "tools/list":
+        return reply(message["id"], {"tools": [{"name": "echo"}, {"name": "sleep"}]})
+    name, arguments = params["name"], params["arguments"]
+    time.sleep(arguments.get("delay", 0))
+    text = lambda value: {"content": [{"type": "text", "text": value}]}
+    if name == "sleep":
+        time.sleep(arguments["seconds"])
+        reply(message["id"], text(f"slept {arguments['seconds']}"))
+    elif name == "image":
+        data = base64.b64encode(b"\x89PNG" + b"\x00" * 100).decode()
+        reply(message["id"], {"content": [
+            {"type": "text", "text": "shot"},
+            {"type": "image", "mimeType": "image/png", "data": data},
+        ]})
+    elif name == "fail":
+        reply(message["id"], error={"code": -32000, "message": "boom"})
+    elif name == "big":
+        reply(message["id"], text("x" * arguments["size"]))
+    elif name == "noisy":
+        sys.stderr.write("n" * arguments["size"] + "\n")
+        sys.stderr.flush()
+        reply(message["id"], text("ok"))
+    elif name == "ask":
+        send({"jsonrpc": "2.0", "id": message["id"], "method": "roots/list"})
+        send({"jsonrpc": "2.0", "method": "notifications/message", "params": {}})
+        reply(message["id"], text("answered"))
+    elif name == "die":
+        sys.stderr.write("fatal: browser crashed\n")
+        sys.stderr.flush()
+        os._exit(1)
+    else:
+        reply(message["id"], text(f"{name} {json.dumps(arguments, sort_keys=True)}"))
+
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" in message:
+        threading.Thread(target=handle, args=(message,), daemon=True).start()
+'''
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def server_script(tmp_path):
+    script = tmp_path / "fake_mcp_server.py"
+    script.write_text(FAKE_SERVER)
+    return str(script)
+
+
+@pytest.fixture
+def make_adapter(server_script):
+    def factory(timeout: float = 5.0) -> MCPAdapter:
+        return MCPAdapter(sys.executable, [server_script], timeout=timeout)
+    return factory
+
+
+def test_call_tool_round_trip(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            assert adapter.is_running
+            assert await adapter.list_tools() == [{"name": "echo"}, {"name": "sleep"}]
+            return [
+                await adapter.call_tool("echo", {"a": 1}),
+                await adapter.call_tool("mcp__puppeteer__echo", {"b": 2}),
+                await adapter.call_tool("fail", {}),
+            ]
+
+    assert run(scenario()) == [
+        {"result": 'echo {"a": 1}'},
+        {"result": 'echo {"b": 2}'},
+        {"error": "MCP error: boom"},
+    ]
+
+
+def test_server_requests_do_not_resolve_pending_calls(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            return await adapter.call_tool("ask", {})
+
+    assert run(scenario()) == {"result": "answered"}
+
+
+def test_responses_larger_than_default_stream_limit(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            return await adapter.call_tool("big", {"size": 2 * 1024 * 1024})
+
+    assert run(scenario()) == {"result": "x" * (2 * 1024 * 1024)}
+
+
+def test_concurrent_requests_are_demultiplexed(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            started = time.monotonic()
+            results = await asyncio.gather(*(
+                adapter.call_tool("sleep", {"seconds": 0.05 * (5 - i)})
+                for i in range(5)
+            ))
+            many = await adapter.call_many([
+                ("sleep", {"seconds": 0.3}),
+                ("echo", {"n": 1}),
+                ("fail", {}),
+            ])
+            return results, many, time.monotonic() - started
+
+    results, many, elapsed = run(scenario())
+    assert results == [{"result": f"slept {0.05 * (5 - i)}"} for i in range(5)]
+    assert many == [
+        {"result": "slept 0.3"},
+        {"result": 'echo {"n": 1}'},
+        {"error": "MCP error: boom"},
+    ]
+    # Run one after another these would take 0.75s + 0.3s
+    assert elapsed < 0.9
+
+
+def test_many_pipelined_writes(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            return await asyncio.gather(*(
+                adapter.call_tool("echo", {"i": i}) for i in range(300)
+            ))
+
+    assert run(scenario()) == [{"result": f'echo {{"i": {i}}}'} for i in range(300)]
+
+
+def test_image_blocks_are_saved_until_stop(make_adapter):
+    async def scenario():
+        async with make_adapter() as adapter:
+            first = await adapter.call_tool("image", {})
+            second = await adapter.call_tool("image", {})
+            paths = [
+                result["result"].split("\n")[1].removeprefix("[Image saved: ")[:-1]
+                for result in (first, second)
+            ]
+            assert all(os.path.isfile(path) for path in paths)
+            assert first["result"].startswith("shot\n")
+        return paths
+
+    paths = run(scenario())
+    assert paths[0] != paths[1]
+    assert os.path.dirname(paths[0]) == os.path.dirname(paths[1])
+    assert all(path.endswith(".png") for path in paths)
+    # stop() removes the adapter's image directory
+    assert not os.path.exists(os.path.dirname(paths[0]))
+
+
+def test_ping_and_health_check(make_adapter):
+    async def scenario():
+        adapter = make_adapter()
+        assert not await adapter.health_check()
+        await adapter.start()
+        try:
+            return await adapter.ping(), await adapter.health_check()
+        finally:
+            await adapter.stop()
+
+    assert run(scenario()) == (True, True)
+
+
+def test_request_timeout(make_adapter):
+    async def scenario():
+        async with make_adapter(timeout=0.2) as adapter:
+            timed_out = await adapter.call_tool("sleep", {"seconds": 1})
+            # The late reply has no waiter and is dropped
+            return timed_out, await adapter.call_tool("echo", {})
+
+    assert run(scenario()) == (
+        {"error": "MCP communication failed: MCP request timed out after 0.2s"},
+        {"result": "echo {}"},
+    )
+
+
+def test_server_exit_fails_pending_requests_with_stderr(make_adapter):
+    async def scenario():
+        adapter = make_adapter()
+        await adapter.start()
+        try:
+            slow = asyncio.create_task(adapter.call_tool("sleep", {"seconds": 5}))
+            await asyncio.sleep(0.1)
+            died = await adapter.call_tool("die", {})
+            return died, await slow, await adapter.health_check()
+        finally:
+            await adapter.stop()
+
+    died, slow, healthy = run(scenario())
+    expected = {"error": "MCP communication failed: MCP server error: fatal: browser crashed\n"}
+    assert died == expected
+    assert slow == expected
+    assert not healthy
+
+
+def test_stderr_tail_is_bounded(make_adapter):
+    async def scenario():
+        adapter = make_adapter()
+        await adapter.start()
+        try:
+            assert await adapter.call_tool("noisy", {"size": 3_000_000}) == {"result": "ok"}
+            return await adapter.call_tool("die", {})
+        finally:
+            await adapter.stop()
+
+    error = run(scenario())["error"]
+    assert len(error) < 2048
+    assert error.endswith(" [... line truncated]\nfatal: browser crashed\n")
+
+
+def test_stop_fails_pending_and_allows_restart(make_adapter):
+    async def scenario():
+        adapter = make_adapter()
+        await adapter.start()
+        pending = asyncio.create_task(adapter.call_tool("sleep", {"seconds": 5}))
+        await asyncio.sleep(0.1)
+        await adapter.stop()
+        stopped = await pending
+        after_stop = await adapter.call_tool("echo", {})
+        await adapter.start()
+        try:
+            return stopped, after_stop, await adapter.call_tool("echo", {})
+        finally:
+            await adapter.stop()
+
+    assert run(scenario()) == (
+        {"error": "MCP communication failed: MCP server stopped"},
+        {"error": "MCP communication failed: MCP server not running"},
+        {"result": "echo {}"},
+    )
+
+
+def test_start_with_missing_command():
+    adapter = MCPAdapter(os.path.join(os.sep, "nonexistent", "mcp-server"), [])
+    with pytest.raises(MCPError, match="command not found"):
+        run(adapter.start())
+
+
+def test_executor_browser_calls(make_adapter, tmp_path):
+    async def scenario():
+        executor = ToolExecutor(tmp_path)
+        async with make_adapter() as adapter:
+            executor.set_mcp_adapter(adapter)
+            try:
+                from_async = await executor.execute_async(
+                    "puppeteer_click", {"selector": "#a"}
+                )
+                # Sync calls from worker threads are scheduled on the adapter's loop
+                from_thread = await asyncio.to_thread(
+                    executor.execute, "puppeteer_click", {"selector": "#b"}
+                )
+                batch = await asyncio.to_thread(executor.execute_many, [
+                    ("puppeteer_click", {"selector": "#c"}),
+                    ("puppeteer_navigate", {"url": "http://localhost"}),
+                ])
+                invalid = await executor.execute_async("puppeteer_click", {})
+                return from_async, from_thread, batch, invalid
+            finally:
+                executor.close()
+
+    from_async, from_thread, batch, invalid = run(scenario())
+    assert from_async == {"result": 'puppeteer_click {"selector": "#a"}'}
+    assert from_thread == {"result": 'puppeteer_click {"selector": "#b"}'}
+    assert batch == [
+        {"result": 'puppeteer_click {"selector": "#c"}'},
+        {"result": 'puppeteer_navigate {"url": "http://localhost"}'},
+    ]
+    assert invalid["error"].startswith("Invalid arguments for puppeteer_click")
+
+
+def test_sync_browser_call_from_adapter_loop_raises(make_adapter, tmp_path):
+    async def scenario():
+        executor = ToolExecutor(tmp_path)
+        async with make_adapter() as adapter:
+            executor.set_mcp_adapter(adapter)
+            try:
+                with pytest.raises(RuntimeError, match="use execute_async"):
+                    executor.execute("puppeteer_click", {"selector": "#a"})
+                with pytest.raises(RuntimeError, match="use execute_async"):
+                    executor.execute_many([("puppeteer_click", {"selector": "#a"})])
+            finally:
+                executor.close()
+
+    run(scenario())
+
+
+def test_execute_many_timeout_returns_separate_results(make_adapter, tmp_path, monkeypatch):
+    monkeypatch.setattr(tools.executor, "_BROWSER_CALL_TIMEOUT", 0.1)
+
+    async def scenario():
+        executor = ToolExecutor(tmp_path)
+        async with make_adapter() as adapter:
+            executor.set_mcp_adapter(adapter)
+            try:
+                return await asyncio.to_thread(executor.execute_many, [
+                    ("puppeteer_click", {"selector": "#a", "delay": 1}),
+                    ("puppeteer_click", {"selector": "#b", "delay": 1}),
+                ])
+            finally:
+                executor.close()
+
+    results = run(scenario())
+    assert results == [{"error": "Browser tools timed out after 0.2s"}] * 2
+    assert results[0] is not results[1]
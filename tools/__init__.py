@@ -6,30 +6,45 @@ Tool definitions and executor for OpenAI-compatible providers.
 Includes both filesystem/bash tools and browser automation tools.
 """
 
-from .definitions import TOOL_DEFINITIONS, get_tool_definitions, get_tool_names
+from .definitions import (
+    FROZEN_TOOL_DEFINITIONS,
+    TOOL_DEFINITIONS,
+    TOOL_NAMES,
+    get_tool_definitions,
+    get_tool_names,
+    get_validator,
+)
 from .browser_definitions import (
     BROWSER_TOOL_DEFINITIONS,
     BROWSER_TOOL_NAMES,
+    FROZEN_BROWSER_TOOL_DEFINITIONS,
     get_browser_tool_definitions,
     get_browser_tool_names,
+    get_browser_validator,
     is_browser_tool,
 )
 from .executor import ToolExecutor, SecurityError
 from .mcp_adapter import MCPAdapter, MCPError, PuppeteerMCPAdapter
-from .sdk_tools import SDK_TOOLS, set_executor
 
 __all__ = [
     # Core tool definitions
     "TOOL_DEFINITIONS",
+    "FROZEN_TOOL_DEFINITIONS",
+    "TOOL_NAMES",
     "get_tool_definitions",
     "get_tool_names",
+    "get_validator",
     # Browser tool definitions
     "BROWSER_TOOL_DEFINITIONS",
     "BROWSER_TOOL_NAMES",
+    "FROZEN_BROWSER_TOOL_DEFINITIONS",
     "get_browser_tool_definitions",
     "get_browser_tool_names",
+    "get_browser_validator",
     "is_browser_tool",
     # Combined tool helper
+    "ALL_TOOL_DEFINITIONS",
+    "ALL_TOOL_NAMES",
     "get_all_tool_definitions",
     # Executor
     "ToolExecutor",
@@ -40,11 +55,34 @@ __all__ = [
     "PuppeteerMCPAdapter",
     # SDK tools (for OpenAI Agents SDK)
     "SDK_TOOLS",
+    "get_sdk_tools",
     "set_executor",
 ]
 
 
-def get_all_tool_definitions(include_browser: bool = False) -> list[dict]:
+# The SDK tool wrappers import the OpenAI Agents SDK, which is slow to load
+# and unused by providers that drive ToolExecutor directly (e.g. Grok).
+# Resolve them on first access instead of at package import (PEP 562).
+_SDK_EXPORTS = frozenset({"SDK_TOOLS", "get_sdk_tools", "set_executor"})
+
+
+def __getattr__(name: str):
+    if name in _SDK_EXPORTS:
+        from . import sdk_tools
+
+        value = getattr(sdk_tools, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Combined definitions, built once so providers don't concatenate per request
+_CORE_TOOL_DEFINITIONS = tuple(TOOL_DEFINITIONS)
+ALL_TOOL_DEFINITIONS = (*TOOL_DEFINITIONS, *BROWSER_TOOL_DEFINITIONS)
+ALL_TOOL_NAMES = frozenset((*TOOL_NAMES, *BROWSER_TOOL_NAMES))
+
+
+def get_all_tool_definitions(include_browser: bool = False) -> tuple[dict, ...]:
     """
     Get all tool definitions, optionally including browser tools.
     
@@ -52,9 +90,8 @@ def get_all_tool_definitions(include_browser: bool = False) -> list[dict]:
         include_browser: Whether to include browser automation tools
         
     Returns:
-        List of tool definitions in OpenAI format
+        Tuple of tool definitions in OpenAI format (shared; do not mutate)
     """
-    tools = list(TOOL_DEFINITIONS)
     if include_browser:
-        tools.extend(BROWSER_TOOL_DEFINITIONS)
-    return tools
+        return ALL_TOOL_DEFINITIONS
+    return _CORE_TOOL_DEFINITIONS
@@ -6,6 +6,14 @@ Defines OpenAI-style function schemas for browser automation tools.
 These tools map to the puppeteer-mcp-server's capabilities.
 """
 
+import itertools
+
+from .schema import Validator, compile_validator, freeze
+
+
+# Prefix the Claude CLI uses when exposing puppeteer MCP tools
+MCP_PUPPETEER_PREFIX = "mcp__puppeteer__"
+
 BROWSER_TOOL_DEFINITIONS = [
     {
         "type": "function",
@@ -181,10 +189,29 @@ BROWSER_TOOL_DEFINITIONS = [
 ]
 
 
-# List of browser tool names
-BROWSER_TOOL_NAMES = [
+# Read-only view of the definitions, safe to share without copying. Pass
+# BROWSER_TOOL_DEFINITIONS itself to API clients, which expect plain dicts/lists.
+FROZEN_BROWSER_TOOL_DEFINITIONS = freeze(BROWSER_TOOL_DEFINITIONS)
+
+# Browser tool names, in definition order
+BROWSER_TOOL_NAMES = tuple(
     tool["function"]["name"] for tool in BROWSER_TOOL_DEFINITIONS
-]
+)
+
+# Every accepted spelling of a browser tool name, bare and MCP-prefixed, so
+# that is_browser_tool is a single membership test
+_BROWSER_TOOL_ALIASES = frozenset(
+    itertools.chain(
+        BROWSER_TOOL_NAMES,
+        (f"{MCP_PUPPETEER_PREFIX}{name}" for name in BROWSER_TOOL_NAMES),
+    )
+)
+
+# Argument validators, compiled once per tool at import
+_BROWSER_VALIDATORS: dict[str, Validator] = {
+    tool["function"]["name"]: compile_validator(tool["function"]["parameters"])
+    for tool in BROWSER_TOOL_DEFINITIONS
+}
 
 
 def get_browser_tool_definitions() -> list[dict]:
@@ -192,14 +219,16 @@ def get_browser_tool_definitions() -> list[dict]:
     return BROWSER_TOOL_DEFINITIONS
 
 
-def get_browser_tool_names() -> list[str]:
-    """Return list of browser tool names."""
+def get_browser_tool_names() -> tuple[str, ...]:
+    """Return browser tool names."""
     return BROWSER_TOOL_NAMES
 
 
 def is_browser_tool(tool_name: str) -> bool:
-    """Check if a tool name is a browser tool."""
-    # Handle both prefixed and unprefixed names
-    if tool_name.startswith("mcp__puppeteer__"):
-        tool_name = tool_name.replace("mcp__puppeteer__", "")
-    return tool_name in BROWSER_TOOL_NAMES
+    """Check if a tool name is a browser tool (prefixed or unprefixed)."""
+    return tool_name in _BROWSER_TOOL_ALIASES
+
+
+def get_browser_validator(name: str) -> Validator:
+    """Return the precompiled argument validator for a browser tool."""
+    return _BROWSER_VALIDATORS[name.removeprefix(MCP_PUPPETEER_PREFIX)]
@@ -5,6 +5,19 @@ Tool Definitions for OpenAI-Compatible Providers
 Defines OpenAI-style function schemas that mirror the Claude CLI tools.
 """
 
+from types import MappingProxyType
+
+from .schema import Validator, compile_validator, freeze
+
+
+# Shared, read-only schema fragments; properties extend them with a description
+_STR = MappingProxyType({"type": "string"})
+_BOOL = MappingProxyType({"type": "boolean"})
+_INT_NONNEG = MappingProxyType({"type": "integer", "minimum": 0})
+_INT_POS = MappingProxyType({"type": "integer", "minimum": 1})
+
+_FILE_PATH_DESCRIPTION = "Relative path to the file (within the project directory)"
+
 TOOL_DEFINITIONS = [
     {
         "type": "function",
@@ -17,18 +30,13 @@ TOOL_DEFINITIONS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the file (within the project directory)",
-                    },
+                    "path": {**_STR, "description": _FILE_PATH_DESCRIPTION},
                     "offset": {
-                        "type": "integer",
-                        "minimum": 0,
+                        **_INT_NONNEG,
                         "description": "Optional 0-based line number to start reading from",
                     },
                     "limit": {
-                        "type": "integer",
-                        "minimum": 1,
+                        **_INT_POS,
                         "description": "Optional number of lines to read starting at offset",
                     },
                 },
@@ -46,14 +54,8 @@ TOOL_DEFINITIONS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the file (within the project directory)",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Content to write",
-                    },
+                    "path": {**_STR, "description": _FILE_PATH_DESCRIPTION},
+                    "content": {**_STR, "description": "Content to write"},
                 },
                 "required": ["path", "content"],
             },
@@ -70,20 +72,11 @@ TOOL_DEFINITIONS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Relative path to the file",
-                    },
-                    "old_string": {
-                        "type": "string",
-                        "description": "Exact text to replace",
-                    },
-                    "new_string": {
-                        "type": "string",
-                        "description": "Replacement text",
-                    },
+                    "path": {**_STR, "description": "Relative path to the file"},
+                    "old_string": {**_STR, "description": "Exact text to replace"},
+                    "new_string": {**_STR, "description": "Replacement text"},
                     "replace_all": {
-                        "type": "boolean",
+                        **_BOOL,
                         "description": "Set true to replace every occurrence (default replaces first only)",
                     },
                 },
@@ -95,16 +88,21 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "glob_search",
-            "description": "List files or directories matching a glob pattern within the sandbox.",
+            "description": (
+                "List files or directories matching a glob pattern within the sandbox. "
+                "Hidden entries are skipped unless a pattern segment starts with '.', "
+                "and the directories .git, node_modules, __pycache__, .venv, venv, "
+                "dist, build, .next, .tox and target are listed but not searched "
+                "unless a pattern segment names them (e.g. 'build/**/*.py'). "
+                ".gitignore is not applied. Directories that contain no files may "
+                "be omitted from '**' matches when ripgrep (rg) is installed."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Glob pattern (supports ** for recursion)",
-                    },
+                    "pattern": {**_STR, "description": "Glob pattern (supports ** for recursion)"},
                     "path": {
-                        "type": "string",
+                        **_STR,
                         "description": "Optional directory to scope the search (defaults to project root)",
                     },
                 },
@@ -123,62 +121,45 @@ TOOL_DEFINITIONS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "pattern": {
-                        "type": "string",
-                        "description": "Regex or literal pattern to search for",
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "File or directory to search (default '.')",
-                    },
-                    "glob": {
-                        "type": "string",
-                        "description": "Optional glob passed to rg --glob",
-                    },
+                    "pattern": {**_STR, "description": "Regex or literal pattern to search for"},
+                    "path": {**_STR, "description": "File or directory to search (default '.')"},
+                    "glob": {**_STR, "description": "Optional glob passed to rg --glob"},
                     "type": {
-                        "type": "string",
+                        **_STR,
                         "description": "Optional ripgrep file type filter (e.g. 'ts', 'py')",
                     },
                     "output_mode": {
-                        "type": "string",
+                        **_STR,
                         "enum": ["content", "files_with_matches", "count"],
                         "description": "Choose detailed content, file list, or counts",
                     },
                     "-A": {
-                        "type": "integer",
-                        "minimum": 0,
+                        **_INT_NONNEG,
                         "description": "Number of lines to show after each match",
                     },
                     "-B": {
-                        "type": "integer",
-                        "minimum": 0,
+                        **_INT_NONNEG,
                         "description": "Number of lines to show before each match",
                     },
                     "-C": {
-                        "type": "integer",
-                        "minimum": 0,
+                        **_INT_NONNEG,
                         "description": "Number of lines to show before and after each match",
                     },
                     "-n": {
-                        "type": "boolean",
+                        **_BOOL,
                         "description": "Show line numbers (default true for content mode)",
                     },
-                    "-i": {
-                        "type": "boolean",
-                        "description": "Case-insensitive search",
-                    },
+                    "-i": {**_BOOL, "description": "Case-insensitive search"},
                     "head_limit": {
-                        "type": "integer",
-                        "minimum": 1,
+                        **_INT_POS,
                         "description": "Limit output lines/entries (similar to piping through head)",
                     },
                     "offset": {
-                        "type": "integer",
-                        "minimum": 0,
+                        **_INT_NONNEG,
                         "description": "Skip this many output lines before applying head_limit",
                     },
                     "multiline": {
-                        "type": "boolean",
+                        **_BOOL,
                         "description": "Enable multiline dotall mode (rg -U --multiline-dotall)",
                     },
                 },
@@ -198,9 +179,9 @@ TOOL_DEFINITIONS = [
                 "type": "object",
                 "properties": {
                     "command": {
-                        "type": "string",
+                        **_STR,
                         "description": "Command to run (e.g. 'npm install', 'git status')",
-                    }
+                    },
                 },
                 "required": ["command"],
             },
@@ -209,11 +190,30 @@ TOOL_DEFINITIONS = [
 ]
 
 
+# Read-only view of the definitions, safe to share without copying. Pass
+# TOOL_DEFINITIONS itself to API clients, which expect plain dicts/lists.
+FROZEN_TOOL_DEFINITIONS = freeze(TOOL_DEFINITIONS)
+
+# Tool names, in definition order
+TOOL_NAMES = tuple(tool["function"]["name"] for tool in TOOL_DEFINITIONS)
+
+# Argument validators, compiled once per tool at import
+_VALIDATORS: dict[str, Validator] = {
+    tool["function"]["name"]: compile_validator(tool["function"]["parameters"])
+    for tool in TOOL_DEFINITIONS
+}
+
+
 def get_tool_definitions() -> list[dict]:
     """Return the list of tool definitions."""
     return TOOL_DEFINITIONS
 
 
-def get_tool_names() -> list[str]:
-    """Return list of available tool names."""
-    return [tool["function"]["name"] for tool in TOOL_DEFINITIONS]
+def get_tool_names() -> tuple[str, ...]:
+    """Return available tool names."""
+    return TOOL_NAMES
+
+
+def get_validator(name: str) -> Validator:
+    """Return the precompiled argument validator for a tool."""
+    return _VALIDATORS[name]
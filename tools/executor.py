@@ -7,14 +7,324 @@ built-in tool execution capabilities.
 """
 
 import asyncio
+import codecs
+import concurrent.futures
+import functools
 import glob
+import mmap
 import os
+import re
+import shlex
 import shutil
+import signal
+import stat
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
 from security import validate_bash_command
+from .browser_definitions import get_browser_validator, is_browser_tool
+from .definitions import get_tool_names, get_validator
+
+
+# Bounds for the decoded-file cache shared by read_file and edit_file
+_READ_CACHE_MAX_ENTRIES = 64
+_READ_CACHE_MAX_CHARS = 32 * 1024 * 1024
+
+# Files at least this large are sniffed for binary content before decoding
+_BINARY_SNIFF_MIN_SIZE = 8 * 1024
+_BINARY_SNIFF_BYTES = 4096
+
+# Files larger than this are scanned through mmap instead of being read in
+_MMAP_THRESHOLD = 1024 * 1024
+
+# Line breaks str.splitlines() honours besides "\n" and "\r\n" (lone CR,
+# VT, FF, FS/GS/RS, NEL, LS, PS), as UTF-8; files containing any of them
+# are paginated on the decoded text instead of by byte offsets
+_OTHER_LINE_BREAKS = re.compile(rb"\r(?!\n)|[\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+# Buffer size for file writes (the default is 8 KiB)
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Bounds for the ripgrep result cache
+_GREP_CACHE_MAX_ENTRIES = 32
+_GREP_CACHE_MAX_CHARS = 4 * 1024 * 1024
+
+# Seconds a cached grep/glob result is reused; directory signatures only
+# see entries added or removed at the top of the search, so this bounds how
+# long changes made deeper down by other processes can go unnoticed
+_SEARCH_CACHE_TTL = 5.0
+
+# Worker threads for execute_async, so overlapping tool calls run in parallel
+_IO_WORKERS = 8
+
+# Worker threads for the Python grep fallback's per-file scan; reading and
+# regex matching mostly run outside the GIL
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Seconds a sync browser tool call may take
+_BROWSER_CALL_TIMEOUT = 60
+
+# Raised when a sync browser call would block the loop it needs
+_BROWSER_LOOP_ERROR = (
+    "Browser tools cannot be called synchronously from the event loop "
+    "running the MCP server; use execute_async instead."
+)
+
+# Dependency/build/VCS directories glob_search never searches (on both the
+# rg and the Python path) unless a pattern segment names them, though it
+# still lists the directories themselves; the grep fallback skips them too
+_WALK_PRUNE_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv",
+    "dist", "build", ".next", ".tox", "target",
+})
+
+# Characters that need /bin/sh: operators, redirection, expansion, quoting
+_SHELL_METACHARS = frozenset("|&;<>()$`\\*?[]{}~#=\n")
+
+
+# A run of one or more non-hidden path segments, as matched by a "**" glob
+_GLOB_ANY_SEGMENTS = r"(?!\.)[^/]+(?:/(?!\.)[^/]+)*"
+
+
+def _translate_glob_segment(segment: str) -> str:
+    """Translate one '/'-free glob segment into a regex fragment."""
+    parts: list[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            j = i + 1 if i < n and segment[i] in "!]" else i
+            j = segment.find("]", j)
+            if j == -1:
+                parts.append(re.escape(char))
+                continue
+            body = segment[i:j].replace("\\", "\\\\")
+            i = j + 1
+            negate = body.startswith("!")
+            # Escape characters re would treat as set operations
+            body = re.sub(r"([&~|\[^])", r"\\\1", body[negate:])
+            parts.append(f"[^/{body}]" if negate else f"[{body}]")
+        else:
+            parts.append(re.escape(char))
+    # Like glob.glob, wildcards never match a leading dot
+    prefix = "" if segment.startswith(".") else r"(?!\.)"
+    return prefix + "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """
+    Compile a recursive glob pattern into a regex over relative paths.
+    
+    Follows glob.glob(recursive=True) semantics: "*", "?" and "[...]"
+    stay within one path segment, "**" spans any number of segments, and
+    hidden names are only matched by segments that start with a dot.
+    Directories must be matched with a trailing '/', since a trailing
+    "**" matches the directory before it but never a file.
+    
+    Args:
+        pattern: Glob pattern using '/' as the separator
+    
+    Returns:
+        Compiled regex to fullmatch against '/'-separated relative paths
+    """
+    segments = pattern.split("/")
+    # Consecutive "**" segments match the same paths as a single one
+    segments = [
+        segment
+        for index, segment in enumerate(segments)
+        if segment != "**" or index == 0 or segments[index - 1] != "**"
+    ]
+    last = len(segments) - 1
+    regex = ""
+    for index, segment in enumerate(segments):
+        if segment != "**":
+            # A name is never empty, even where "*" could match nothing
+            regex += "(?=[^/])" + _translate_glob_segment(segment)
+            regex += "/?" if index == last else "/"
+        elif index < last:
+            regex += r"(?:(?!\.)[^/]+/)*"
+        elif regex:
+            # Trailing "**" also matches the directory itself ("src/")
+            regex += f"(?:{_GLOB_ANY_SEGMENTS}/?)?"
+        else:
+            regex = f"{_GLOB_ANY_SEGMENTS}/?"
+    return re.compile(regex, re.DOTALL)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_search_regex(
+    pattern: str,
+    ignore_case: bool,
+    multiline: bool,
+) -> re.Pattern:
+    """Compile a grep_search pattern for the Python fallback scan."""
+    # The scan runs over whole files, so ^/$ must still anchor at lines
+    flags = re.MULTILINE
+    if ignore_case:
+        flags |= re.IGNORECASE
+    if multiline:
+        flags |= re.DOTALL  # like rg --multiline-dotall
+    return re.compile(pattern, flags)
+
+
+def _matching_lines(
+    regex: re.Pattern,
+    content: str,
+    multiline: bool,
+    first_only: bool = False,
+) -> list[int]:
+    """
+    Return the 0-based indexes of the lines of content that regex matches.
+    
+    The regex runs over the whole text rather than line by line, and line
+    numbers are found by counting newlines between matches. Without
+    multiline, a match that runs past its line (e.g. through \\s) is
+    re-checked within that line only, as rg's line-oriented search would.
+    """
+    matched: list[int] = []
+    line_index = 0
+    counted_to = 0
+    pos = 0
+    while True:
+        match = regex.search(content, pos)
+        if match is None:
+            break
+        start = match.start()
+        if start == len(content) and content.endswith("\n"):
+            break  # an empty match after the final newline is not a line
+        line_start = content.rfind("\n", 0, start) + 1
+        line_end = content.find("\n", start)
+        if line_end < 0:
+            line_end = len(content)
+        line_index += content.count("\n", counted_to, line_start)
+        counted_to = line_start
+        
+        if multiline:
+            # Every line the match touches counts as a matching line
+            end = max(match.end() - 1, start)
+            last_index = line_index + content.count("\n", start, end)
+            first_new = matched[-1] + 1 if matched else 0
+            matched.extend(range(max(line_index, first_new), last_index + 1))
+            pos = max(match.end(), start + 1)
+        else:
+            if match.end() <= line_end or regex.search(content, line_start, line_end):
+                matched.append(line_index)
+            pos = line_end + 1
+        if first_only and matched:
+            break
+        if pos > len(content):
+            break
+    return matched
+
+
+def _split_simple_command(command: str) -> Optional[list[str]]:
+    """
+    Split a command that uses no shell features into an argv list.
+    
+    Returns:
+        The argv list, or None if the command has to go through the shell
+    """
+    if any(char in _SHELL_METACHARS for char in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    return argv or None
+
+
+def _decode_output(data: bytes) -> str:
+    """
+    Decode subprocess output the way a text-mode pipe would.
+    
+    Undecodable bytes are replaced, and "\r\n" and lone "\r" (CRLF files,
+    progress bars) become "\n", as with universal newlines.
+    """
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _format_content_lines(
+    rel_path: Optional[str],
+    file_lines: list[str],
+    matched: list[int],
+    before: int,
+    after: int,
+    show_numbers: bool,
+) -> list[str]:
+    """
+    Format one file's matches the way rg's content output does.
+    
+    Matching lines use ':' after the path/line number and context lines
+    use '-', with '--' between non-adjacent groups. Long lines are cut
+    like rg's --max-columns=512 --max-columns-preview.
+    """
+    matched_set = set(matched)
+    output: list[str] = []
+    last = -1
+    for index in matched:
+        first = max(index - before, last + 1)
+        if output and (before or after) and first > last + 1:
+            output.append("--")
+        for line_index in range(first, min(index + after, len(file_lines) - 1) + 1):
+            sep = ":" if line_index in matched_set else "-"
+            text = file_lines[line_index]
+            if len(text) > 512:
+                text = text[:512] + " [... omitted end of long line]"
+            prefix = f"{rel_path}{sep}" if rel_path is not None else ""
+            if show_numbers:
+                prefix += f"{line_index + 1}{sep}"
+            output.append(prefix + text)
+        last = max(last, min(index + after, len(file_lines) - 1))
+    return output
+
+
+def _decode_line_window(buf: bytes | mmap.mmap, start: int, stop: int | None) -> str:
+    """
+    Decode lines [start, stop) of a UTF-8 buffer as one slice.
+    
+    Line boundaries are found with find(), so only the window itself is
+    copied and decoded. CRLF line endings are returned as LF. Only valid
+    for buffers whose line breaks are all LF or CRLF; see _split_line_window.
+    """
+    size = len(buf)
+    
+    def skip_lines(pos: int, count: int) -> int:
+        for _ in range(count):
+            newline = buf.find(b"\n", pos)
+            if newline < 0:
+                return size
+            pos = newline + 1
+        return pos
+    
+    begin = skip_lines(0, start)
+    end = size if stop is None else skip_lines(begin, stop - start)
+    text = buf[begin:end].decode("utf-8")
+    return text.removesuffix("\n").replace("\r\n", "\n").removesuffix("\r")
+
+
+def _split_line_window(text: str, start: int, stop: int | None) -> tuple[str, int]:
+    """
+    Return lines [start, stop) of text and its total line count.
+    
+    Lines are split with str.splitlines(), the definition every paginated
+    read uses; the byte-offset fast path agrees with it for LF/CRLF files.
+    """
+    lines = text.splitlines()
+    return "\n".join(lines[start:stop]), len(lines)
 
 
 class SecurityError(Exception):
@@ -22,6 +332,13 @@ class SecurityError(Exception):
     pass
 
 
+@dataclass
+class ValidatedPath:
+    """A sandbox-checked path plus the stat taken while checking it."""
+    path: Path
+    st: Optional[os.stat_result]  # None if the path does not exist
+
+
 class ToolExecutor:
     """
     Executes tools in a sandboxed environment.
@@ -45,6 +362,59 @@ class ToolExecutor:
         """
         self.project_dir = project_dir.resolve()
         self._mcp_adapter = mcp_adapter
+        
+        # String forms used by the lexical sandbox check in _validate_path
+        self._project_root = str(self.project_dir)
+        self._project_prefix = os.path.join(self._project_root, "")
+        
+        # Looked up once; shutil.which stats every PATH entry
+        self._rg_path: Optional[str] = shutil.which("rg")
+        
+        # path -> (st_mtime_ns, st_size, text); validated against stat on use
+        self._read_cache: OrderedDict[Path, tuple[int, int, str]] = OrderedDict()
+        self._read_cache_chars = 0
+        
+        # rg command (+ project dir signature) -> (expiry,
+        # (returncode, stdout lines, stderr, complete)); cleared whenever a
+        # mutating tool runs
+        self._grep_cache: OrderedDict[tuple, tuple[float, tuple]] = OrderedDict()
+        
+        # (pattern, base dir, project and base dir signatures) ->
+        # (expiry, glob_search result); cleared alongside the grep cache
+        self._glob_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        
+        self._cache_lock = threading.Lock()  # execute_async uses threads
+        
+        # Dedicated pool for execute_async rather than the loop's default
+        # executor, which is shared with every other run_in_executor user
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_IO_WORKERS,
+            thread_name_prefix="tool-io",
+        )
+        # Separate from _io_executor: a grep running on an I/O worker must
+        # never wait on tasks queued behind it in its own pool
+        self._scan_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_SCAN_WORKERS,
+            thread_name_prefix="tool-scan",
+        )
+        
+        # Event loop thread for sync browser calls, started on first use
+        self._background_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._background_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Release the worker threads and event loop used by the executor."""
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        self._scan_executor.shutdown(wait=False, cancel_futures=True)
+        with self._loop_lock:
+            loop, thread = self._background_loop, self._background_thread
+            self._background_loop = self._background_thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=1)
+            if not loop.is_running():
+                loop.close()
     
     def set_mcp_adapter(self, adapter: Any) -> None:
         """
@@ -65,72 +435,129 @@ class ToolExecutor:
             
         Returns:
             Dict with 'result' or 'error' key
+            
+        Raises:
+            RuntimeError: If a browser tool is called from the event loop
+                the MCP adapter runs on, where blocking for the reply would
+                deadlock; use execute_async there instead
         """
         # Check if this is a browser tool
-        if self._is_browser_tool(tool_name):
+        if is_browser_tool(tool_name):
             return self._execute_browser_tool(tool_name, arguments)
         
-        # Handle standard tools
-        try:
-            if tool_name == "read_file":
-                return self._read_file(
-                    path=arguments["path"],
-                    offset=arguments.get("offset"),
-                    limit=arguments.get("limit"),
-                )
-            if tool_name == "write_file":
-                return self._write_file(arguments["path"], arguments["content"])
-            if tool_name == "edit_file":
-                return self._edit_file(
-                    path=arguments["path"],
-                    old_string=arguments["old_string"],
-                    new_string=arguments["new_string"],
-                    replace_all=arguments.get("replace_all", False),
-                )
-            if tool_name == "glob_search":
-                return self._glob_search(arguments["pattern"], arguments.get("path"))
-            if tool_name == "grep_search":
-                return self._grep_search(
-                    pattern=arguments["pattern"],
-                    path=arguments.get("path"),
-                    glob_pattern=arguments.get("glob"),
-                    file_type=arguments.get("type"),
-                    output_mode=arguments.get("output_mode", "files_with_matches"),
-                    before=arguments.get("-B"),
-                    after=arguments.get("-A"),
-                    context=arguments.get("-C"),
-                    line_numbers=arguments.get("-n"),
-                    ignore_case=arguments.get("-i"),
-                    head_limit=arguments.get("head_limit"),
-                    offset=arguments.get("offset"),
-                    multiline=arguments.get("multiline", False),
-                )
-            if tool_name == "bash":
-                return self._run_bash(arguments["command"])
+        handler = TOOL_HANDLERS.get(tool_name)
+        if handler is None:
             return {"error": f"Unknown tool: {tool_name}"}
+        
+        problem = get_validator(tool_name)(arguments)
+        if problem:
+            return {"error": f"Invalid arguments for {tool_name}: {problem}"}
+        
+        try:
+            return handler(self, arguments)
         except SecurityError as e:
             return {"error": f"Security violation: {str(e)}"}
         except Exception as e:
             return {"error": f"Tool execution failed: {str(e)}"}
     
-    def _is_browser_tool(self, tool_name: str) -> bool:
-        """Check if a tool is a browser automation tool."""
-        browser_tools = {
-            "puppeteer_connect_active_tab",
-            "puppeteer_navigate",
-            "puppeteer_screenshot",
-            "puppeteer_click",
-            "puppeteer_fill",
-            "puppeteer_select",
-            "puppeteer_hover",
-            "puppeteer_evaluate",
-        }
-        
-        # Handle prefixed names
-        if tool_name.startswith("mcp__puppeteer__"):
-            tool_name = tool_name.replace("mcp__puppeteer__", "")
-        
-        return tool_name in browser_tools
+    def execute_many(self, calls: list[tuple[str, dict]]) -> list[dict[str, Any]]:
+        """
+        Execute several independent tool calls.
+        
+        When every call is a browser tool they are issued together on the
+        background event loop, so the MCP round-trips overlap instead of
+        each waiting for the previous one. Other batches run one by one.
+        Only batch calls that don't depend on each other's results.
+        
+        Args:
+            calls: (tool_name, arguments) pairs
+            
+        Returns:
+            One dict with 'result' or 'error' key per call, in order
+            
+        Raises:
+            RuntimeError: If browser tools are batched from the event loop
+                the MCP adapter runs on (see execute)
+        """
+        if not (
+            self._mcp_adapter
+            and calls
+            and all(is_browser_tool(name) for name, _ in calls)
+        ):
+            return [self.execute(name, arguments) for name, arguments in calls]
+        
+        loop = self._browser_loop()
+        if loop is None:
+            raise RuntimeError(_BROWSER_LOOP_ERROR)
+        
+        timeout = _BROWSER_CALL_TIMEOUT * len(calls)
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute_browser_batch(calls),
+            loop,
+        )
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            message = f"Browser tools timed out after {timeout}s"
+        except Exception as e:
+            message = f"Browser tool execution failed: {str(e)}"
+        # A separate dict per call, so callers can annotate results freely
+        return [{"error": message} for _ in calls]
+    
+    async def _execute_browser_batch(
+        self,
+        calls: list[tuple[str, dict]]
+    ) -> list[dict[str, Any]]:
+        """Run browser tool calls concurrently, keeping results in order."""
+        return list(await asyncio.gather(*(
+            self._execute_browser_tool_async(name, arguments)
+            for name, arguments in calls
+        )))
+    
+    # Handlers adapt raw tool arguments to the implementation methods.
+    # They are registered by tool name in TOOL_HANDLERS below.
+    
+    def _handle_read_file(self, arguments: dict) -> dict[str, Any]:
+        return self._read_file(
+            path=arguments["path"],
+            offset=arguments.get("offset"),
+            limit=arguments.get("limit"),
+        )
+    
+    def _handle_write_file(self, arguments: dict) -> dict[str, Any]:
+        return self._write_file(arguments["path"], arguments["content"])
+    
+    def _handle_edit_file(self, arguments: dict) -> dict[str, Any]:
+        return self._edit_file(
+            path=arguments["path"],
+            old_string=arguments["old_string"],
+            new_string=arguments["new_string"],
+            replace_all=arguments.get("replace_all", False),
+        )
+    
+    def _handle_glob_search(self, arguments: dict) -> dict[str, Any]:
+        return self._glob_search(arguments["pattern"], arguments.get("path"))
+    
+    def _handle_grep_search(self, arguments: dict) -> dict[str, Any]:
+        return self._grep_search(
+            pattern=arguments["pattern"],
+            path=arguments.get("path"),
+            glob_pattern=arguments.get("glob"),
+            file_type=arguments.get("type"),
+            output_mode=arguments.get("output_mode", "files_with_matches"),
+            before=arguments.get("-B"),
+            after=arguments.get("-A"),
+            context=arguments.get("-C"),
+            line_numbers=arguments.get("-n"),
+            ignore_case=arguments.get("-i"),
+            head_limit=arguments.get("head_limit"),
+            offset=arguments.get("offset"),
+            multiline=arguments.get("multiline", False),
+        )
+    
+    def _handle_bash(self, arguments: dict) -> dict[str, Any]:
+        return self._run_bash(arguments["command"])
     
     def _execute_browser_tool(self, tool_name: str, arguments: dict) -> dict[str, Any]:
         """
@@ -142,6 +569,10 @@ class ToolExecutor:
             
         Returns:
             Dict with 'result' or 'error' key
+            
+        Raises:
+            RuntimeError: If called from the event loop the MCP adapter
+                runs on (see execute)
         """
         if not self._mcp_adapter:
             return {
@@ -151,31 +582,68 @@ class ToolExecutor:
                 )
             }
         
-        # Run the async call in an event loop
+        problem = get_browser_validator(tool_name)(arguments)
+        if problem:
+            return {"error": f"Invalid arguments for {tool_name}: {problem}"}
+        
+        loop = self._browser_loop()
+        if loop is None:
+            raise RuntimeError(_BROWSER_LOOP_ERROR)
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self._mcp_adapter.call_tool(tool_name, arguments),
+            loop,
+        )
         try:
-            # Check if we're already in an event loop
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                loop = None
-            
-            if loop:
-                # We're in an async context, create a task
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        asyncio.run,
-                        self._mcp_adapter.call_tool(tool_name, arguments)
-                    )
-                    return future.result(timeout=60)
-            else:
-                # We're not in an async context
-                return asyncio.run(
-                    self._mcp_adapter.call_tool(tool_name, arguments)
-                )
+            return future.result(timeout=_BROWSER_CALL_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return {"error": f"Browser tool timed out after {_BROWSER_CALL_TIMEOUT}s"}
         except Exception as e:
             return {"error": f"Browser tool execution failed: {str(e)}"}
     
+    def _browser_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        Return the loop sync browser calls should be scheduled on.
+        
+        An adapter whose pipes are bound to an event loop (MCPAdapter
+        exposes it as .loop) must be driven from that loop. Otherwise the
+        executor's own background loop is used, which works the same
+        whether or not the caller is inside a running event loop.
+        
+        Returns:
+            The loop, or None if blocking on it from here would deadlock
+        """
+        loop = getattr(self._mcp_adapter, "loop", None)
+        if loop is None:
+            return self._get_background_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        return None if running is loop else loop
+    
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Return the event loop used by sync browser calls.
+        
+        The loop runs forever on a daemon thread started on first use, so
+        each call is a cheap run_coroutine_threadsafe instead of building
+        and tearing down a new loop (and thread pool) per call.
+        """
+        with self._loop_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="tool-browser-loop",
+                    daemon=True,
+                )
+                thread.start()
+                self._background_loop = loop
+                self._background_thread = thread
+            return self._background_loop
+    
     async def execute_async(self, tool_name: str, arguments: dict) -> dict[str, Any]:
         """
         Execute a tool asynchronously.
@@ -191,14 +659,16 @@ class ToolExecutor:
             Dict with 'result' or 'error' key
         """
         # Check if this is a browser tool
-        if self._is_browser_tool(tool_name):
+        if is_browser_tool(tool_name):
             return await self._execute_browser_tool_async(tool_name, arguments)
         
-        # For sync tools, run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        # For sync tools, run on the I/O pool to avoid blocking
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
-            None,
-            lambda: self.execute(tool_name, arguments)
+            self._io_executor,
+            self.execute,
+            tool_name,
+            arguments,
         )
     
     async def _execute_browser_tool_async(
@@ -224,6 +694,10 @@ class ToolExecutor:
                 )
             }
         
+        problem = get_browser_validator(tool_name)(arguments)
+        if problem:
+            return {"error": f"Invalid arguments for {tool_name}: {problem}"}
+        
         try:
             return await self._mcp_adapter.call_tool(tool_name, arguments)
         except Exception as e:
@@ -242,43 +716,95 @@ class ToolExecutor:
         Raises:
             SecurityError: If path escapes the project directory
         """
-        # Resolve the path relative to project directory
-        resolved = (self.project_dir / path).resolve()
+        return self._stat_path(path).path
+    
+    def _stat_path(self, path: str) -> ValidatedPath:
+        """
+        Validate a path like _validate_path and also return its stat.
+        
+        The lstat used to look for a symlink at the leaf doubles as the
+        file's stat, so callers don't need exists()/is_file() syscalls.
+        
+        Raises:
+            SecurityError: If path escapes the project directory
+        """
+        # Lexical check first; project_dir itself was resolved in __init__
+        normed = os.path.normpath(os.path.join(self._project_root, path))
+        if normed != self._project_root and not normed.startswith(self._project_prefix):
+            raise SecurityError(f"Path escape attempt blocked: {path}")
         
-        # Check that resolved path is within project directory
         try:
-            resolved.relative_to(self.project_dir)
-        except ValueError:
+            st = os.lstat(normed)
+        except OSError:
+            st = None
+        
+        # Only a symlink below the project dir can lead outside it, so the
+        # realpath() walk is paid for just when one is present
+        linked = st is not None and stat.S_ISLNK(st.st_mode)
+        probe = os.path.dirname(normed)
+        while not linked and len(probe) > len(self._project_root):
+            linked = os.path.islink(probe)
+            probe = os.path.dirname(probe)
+        if not linked:
+            return ValidatedPath(Path(normed), st)
+        
+        resolved = Path(normed).resolve()
+        if self._project_relative(str(resolved)) is None:
             raise SecurityError(f"Path escape attempt blocked: {path}")
+        try:
+            st = resolved.stat()
+        except OSError:
+            st = None
+        return ValidatedPath(resolved, st)
+    
+    def _project_relative(self, full_path: str) -> Optional[str]:
+        """
+        Return an absolute path relative to the project dir, or None.
         
-        return resolved
+        A string prefix check against the resolved project dir, used in
+        place of Path.relative_to on per-entry paths.
+        """
+        if full_path == self._project_root:
+            return "."
+        if full_path.startswith(self._project_prefix):
+            return full_path[len(self._project_prefix):]
+        return None
     
     def _read_file(self, path: str, offset: int | None, limit: int | None) -> dict[str, Any]:
         """Read a file's contents with optional pagination."""
-        file_path = self._validate_path(path)
+        target = self._stat_path(path)
+        file_path, st = target.path, target.st
         
-        if not file_path.exists():
+        if st is None:
             return {"error": f"File not found: {path}"}
         
-        if not file_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return {"error": f"Not a file: {path}"}
         
-        try:
-            content = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            return {"error": f"Cannot read binary file: {path}"}
-        
         if offset is not None and offset < 0:
             return {"error": "Offset must be zero or positive"}
         if limit is not None and limit < 1:
             return {"error": "Limit must be positive"}
+        
+        if not self._is_probably_text(file_path, st.st_size):
+            return {"error": f"Cannot read binary file: {path}"}
 
         if offset is None and limit is None:
-            return {"result": content}
+            try:
+                return {"result": self._load_text(file_path, st)}
+            except UnicodeDecodeError:
+                return {"error": f"Cannot read binary file: {path}"}
+        
+        start = offset or 0
+        stop = start + limit if limit else None
+        try:
+            if st.st_size > _MMAP_THRESHOLD:
+                body, total_lines = self._read_window_mmap(file_path, start, stop)
+            else:
+                body, total_lines = self._read_window_bytes(file_path, start, stop)
+        except UnicodeDecodeError:
+            return {"error": f"Cannot read binary file: {path}"}
         
-        lines = content.splitlines()
-        total_lines = len(lines)
-        start = max(offset or 0, 0)
         if total_lines == 0:
             if start == 0:
                 return {"result": "[lines 0-0 of 0] (file is empty)"}
@@ -287,21 +813,188 @@ class ToolExecutor:
             return {
                 "error": f"Offset {start} beyond end of file (total {total_lines} lines)"
             }
-        end = start + limit if limit else total_lines
-        selected = lines[start:end]
+        end = stop if stop is not None else total_lines
         header = f"[lines {start + 1}-{min(end, total_lines)} of {total_lines}]\n"
-        return {"result": header + "\n".join(selected)}
+        return {"result": f"{header}{body}"}
+    
+    @staticmethod
+    def _is_probably_text(file_path: Path, size: int) -> bool:
+        """
+        Sniff the start of a file so binaries are rejected before a full read.
+        
+        Small files are not sniffed; reading them outright costs the same.
+        A file is treated as binary if its first 4 KiB contain a NUL byte or
+        are not valid UTF-8 (a character cut off at the end is allowed).
+        """
+        if size < _BINARY_SNIFF_MIN_SIZE:
+            return True
+        with file_path.open("rb") as f:
+            head = f.read(_BINARY_SNIFF_BYTES)
+        if b"\x00" in head:
+            return False
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        except UnicodeDecodeError:
+            return False
+        return True
+    
+    @staticmethod
+    def _read_window_bytes(
+        file_path: Path, start: int, stop: int | None
+    ) -> tuple[str, int]:
+        """
+        Return the text of lines [start, stop) and the file's total line count.
+        
+        For small files: the bytes are read in one call, and only the
+        window's byte range is decoded, as a single slice with no per-line
+        list or join.
+        """
+        data = file_path.read_bytes()
+        if _OTHER_LINE_BREAKS.search(data):
+            return _split_line_window(data.decode("utf-8"), start, stop)
+        total_lines = data.count(b"\n")
+        if data and data[-1] != ord("\n"):
+            total_lines += 1  # last line has no trailing newline
+        return _decode_line_window(data, start, stop), total_lines
+    
+    @staticmethod
+    def _read_window_mmap(
+        file_path: Path, start: int, stop: int | None
+    ) -> tuple[str, int]:
+        """
+        Return the text of lines [start, stop) and the file's total line count.
+        
+        For large files: the window's byte range is located with mmap.find
+        and decoded in one slice, so nothing outside it is decoded and the
+        kernel only pages in what the scans touch.
+        """
+        with file_path.open("rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            size = len(mm)
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                # Both passes below read front to back: ask for aggressive
+                # read-ahead and early reuse of pages already scanned
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            
+            if _OTHER_LINE_BREAKS.search(mm):
+                return _split_line_window(mm[:].decode("utf-8"), start, stop)
+            
+            # Count newlines over bounded slices (mmap has no count())
+            total_lines = 0
+            for chunk_start in range(0, size, 1 << 20):
+                total_lines += mm[chunk_start:chunk_start + (1 << 20)].count(b"\n")
+            if mm[size - 1] != ord("\n"):
+                total_lines += 1  # last line has no trailing newline
+            
+            return _decode_line_window(mm, start, stop), total_lines
+    
+    def _load_text(
+        self,
+        file_path: Path,
+        st: Optional[os.stat_result] = None,
+    ) -> str:
+        """
+        Return a file's decoded text, reusing the cached copy when unchanged.
+        
+        Entries are keyed by path and validated against the file's current
+        mtime and size, so edits made outside the executor are picked up.
+        
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if st is None:
+            st = file_path.stat()
+        text = self._cached_text(file_path, st)
+        if text is not None:
+            return text
+        
+        text = file_path.read_text(encoding="utf-8")
+        if len(text) > _READ_CACHE_MAX_CHARS:
+            return text
+        with self._cache_lock:
+            self._pop_cached_text(file_path)
+            self._read_cache[file_path] = (st.st_mtime_ns, st.st_size, text)
+            self._read_cache_chars += len(text)
+            while (
+                len(self._read_cache) > _READ_CACHE_MAX_ENTRIES
+                or self._read_cache_chars > _READ_CACHE_MAX_CHARS
+            ):
+                _, (_, _, evicted) = self._read_cache.popitem(last=False)
+                self._read_cache_chars -= len(evicted)
+        return text
+    
+    def _cached_text(
+        self,
+        file_path: Path,
+        st: Optional[os.stat_result] = None,
+    ) -> Optional[str]:
+        """Return the cached text for a file if it is still current, else None."""
+        if st is None:
+            st = file_path.stat()
+        with self._cache_lock:
+            cached = self._read_cache.get(file_path)
+            if cached is None:
+                return None
+            mtime_ns, size, text = cached
+            if mtime_ns != st.st_mtime_ns or size != st.st_size:
+                return None
+            self._read_cache.move_to_end(file_path)
+            return text
+    
+    def _forget_text(self, file_path: Path) -> None:
+        """Drop a file from the read cache (after we modify it)."""
+        with self._cache_lock:
+            self._pop_cached_text(file_path)
+    
+    def _pop_cached_text(self, file_path: Path) -> None:
+        """Remove a cache entry; caller must hold _cache_lock."""
+        cached = self._read_cache.pop(file_path, None)
+        if cached is not None:
+            self._read_cache_chars -= len(cached[2])
     
     def _write_file(self, path: str, content: str) -> dict[str, Any]:
         """Write content to a file."""
         file_path = self._validate_path(path)
         
-        # Create parent directories if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Create parent directories if needed (the project dir always exists)
+        if file_path.parent != self.project_dir:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_path.write_text(content, encoding="utf-8")
+        self._write_text(file_path, content)
+        self._forget_text(file_path)
+        self._invalidate_search_caches()
         return {"result": f"Successfully wrote {len(content)} bytes to {path}"}
     
+    @staticmethod
+    def _write_text(file_path: Path, content: str) -> None:
+        """
+        Write text as UTF-8, replacing the file.
+        
+        Small contents go through a 64 KiB buffered writer. Larger ones are
+        encoded once and handed to os.write directly, skipping the text and
+        buffer layers that would otherwise copy them again in chunks.
+        """
+        if len(content) <= _WRITE_BUFFER_SIZE:
+            with file_path.open(
+                "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                f.write(content)
+            return
+        
+        ToolExecutor._write_bytes(file_path, content.encode("utf-8"))
+    
+    @staticmethod
+    def _write_bytes(file_path: Path, data: bytes) -> None:
+        """Replace a file's contents with data using unbuffered os.write."""
+        view = memoryview(data)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    
     def _edit_file(
         self,
         path: str,
@@ -310,54 +1003,294 @@ class ToolExecutor:
         replace_all: bool,
     ) -> dict[str, Any]:
         """Make a targeted edit to a file."""
-        file_path = self._validate_path(path)
+        target = self._stat_path(path)
+        file_path, st = target.path, target.st
         
-        if not file_path.exists():
+        if st is None:
             return {"error": f"File not found: {path}"}
         
-        content = file_path.read_text(encoding="utf-8")
+        if not stat.S_ISREG(st.st_mode):
+            return {"error": f"Not a file: {path}"}
+        
+        if not self._is_probably_text(file_path, st.st_size):
+            return {"error": f"Cannot edit binary file: {path}"}
         
-        occurrences = content.count(old_string)
-        if occurrences == 0:
-            preview = old_string[:100] + ("..." if len(old_string) > 100 else "")
-            return {"error": f"String not found in file: {preview}"}
+        preview = old_string[:100] + ("..." if len(old_string) > 100 else "")
+        old_bytes = old_string.encode("utf-8")
+        data = file_path.read_bytes()
         
-        if not replace_all:
-            new_content = content.replace(old_string, new_string, 1)
+        # The sniff above skips small files, so check the whole file the
+        # way read_file does: NUL bytes mean binary
+        if b"\x00" in data:
+            return {"error": f"Cannot edit binary file: {path}"}
+        
+        if not old_string or (b"\n" in old_bytes and b"\r" in data):
+            # Text mode reads CRLF as LF, so a multi-line old_string may
+            # match CRLF lines the raw bytes don't; an empty one counts
+            # characters
+            return self._edit_text(
+                file_path, st, path, old_string, new_string, replace_all
+            )
+        
+        # Otherwise work on the raw UTF-8 bytes: the encoded needle matches
+        # exactly where the string matches the text, so a miss is reported
+        # without decoding the file and a hit is never re-encoded. Single
+        # replacements only need the first match, so avoid a full count()
+        # pass over the file; replace_all needs the count to report.
+        if replace_all:
+            replaced = data.count(old_bytes)
+            index = 0 if replaced else -1
+        else:
+            index = data.find(old_bytes)
             replaced = 1
+        if index < 0:
+            return {"error": f"String not found in file: {preview}"}
+        
+        # Invalid UTF-8 means binary too, as for read_file
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError:
+            return {"error": f"Cannot edit binary file: {path}"}
+        
+        new_bytes = new_string.encode("utf-8")
+        if replace_all:
+            new_data = data.replace(old_bytes, new_bytes)
         else:
+            new_data = b"".join(
+                (data[:index], new_bytes, data[index + len(old_bytes):])
+            )
+        
+        self._write_bytes(file_path, new_data)
+        self._forget_text(file_path)
+        self._invalidate_search_caches()
+        return {"result": f"Replaced {replaced} occurrence(s) in {path}"}
+    
+    def _edit_text(
+        self,
+        file_path: Path,
+        st: os.stat_result,
+        path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool,
+    ) -> dict[str, Any]:
+        """Make an edit on the decoded text (newlines normalized to LF)."""
+        try:
+            content = self._load_text(file_path, st)
+        except UnicodeDecodeError:
+            return {"error": f"Cannot edit binary file: {path}"}
+        
+        if replace_all:
+            replaced = content.count(old_string)
+            index = 0 if replaced else -1
+        else:
+            index = content.find(old_string)
+            replaced = 1
+        if index < 0:
+            preview = old_string[:100] + ("..." if len(old_string) > 100 else "")
+            return {"error": f"String not found in file: {preview}"}
+        
+        if replace_all:
             new_content = content.replace(old_string, new_string)
-            replaced = occurrences
+        else:
+            new_content = (
+                content[:index] + new_string + content[index + len(old_string):]
+            )
         
-        file_path.write_text(new_content, encoding="utf-8")
+        self._write_text(file_path, new_content)
+        self._forget_text(file_path)
+        self._invalidate_search_caches()
         return {"result": f"Replaced {replaced} occurrence(s) in {path}"}
     
     def _glob_search(self, pattern: str, path: str | None) -> dict[str, Any]:
         """Search for files/directories matching a glob pattern."""
-        base_dir = self.project_dir if not path else self._validate_path(path)
-        if not base_dir.exists():
+        target = self._stat_path(path or ".")
+        base_dir = target.path
+        if target.st is None:
             return {"error": f"Directory not found: {path or '.'}"}
-        if not base_dir.is_dir():
+        if not stat.S_ISDIR(target.st.st_mode):
             return {"error": f"Not a directory: {path or '.'}"}
 
+        pattern = pattern.removeprefix("./")
+        key = (
+            pattern,
+            str(base_dir),
+            self._dir_signature(),
+            target.st.st_mtime_ns,
+        )
+        with self._cache_lock:
+            cached = self._cache_lookup(self._glob_cache, key)
+            if cached is not None:
+                return {"result": cached}
+        
+        if os.path.isabs(pattern) or ".." in pattern.split("/"):
+            matches = self._glob_search_resolved(pattern, base_dir)
+        else:
+            base_rel = self._project_relative(str(base_dir))
+            prefix = "" if base_rel == "." else f"{base_rel}/"
+            entries = None
+            # rg only pays off for "**"; other patterns stop at a fixed
+            # depth, and the walk also finds directories holding no files
+            if self._rg_path and "**" in pattern.split("/"):
+                entries = self._rg_glob(pattern, base_dir, prefix)
+            if entries is None:
+                entries = self._walk_glob(pattern, base_dir)
+            matches = [prefix + entry for entry in entries]
+
+        if matches:
+            output = "\n".join(sorted(set(matches)))
+        else:
+            output = "No matches found"
+        
+        if len(output) <= _GREP_CACHE_MAX_CHARS:
+            with self._cache_lock:
+                self._cache_store(self._glob_cache, key, output)
+        return {"result": output}
+
+    def _walk_glob(self, pattern: str, base_dir: Path) -> Iterator[str]:
+        """
+        Yield paths under base_dir, relative to it, that match pattern.
+        
+        The walk stops descending once it is deeper than a pattern without
+        "**" could reach, and skips hidden entries the pattern could never
+        match. Directories in _WALK_PRUNE_DIRS are listed when they match
+        but not searched, as _rg_glob excludes them, unless a pattern
+        segment names them. Symlinks are never followed; they are listed
+        only if they resolve inside the sandbox.
+        """
+        dirs_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return
+        segments = pattern.split("/")
+        regex = _compile_glob(pattern)
+        max_depth = None if "**" in segments else len(segments)
+        match_hidden = any(segment.startswith(".") for segment in segments)
+        prune = _WALK_PRUNE_DIRS.difference(segments)
+
+        # Depth-first over os.scandir: DirEntry type checks come from the
+        # directory listing itself, so ordinary entries cost no stat() call
+        stack = [(str(base_dir), "", 0)]
+        while stack:
+            dir_path, rel_dir, depth = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            descend = max_depth is None or depth + 1 < max_depth
+            for entry in entries:
+                name = entry.name
+                if not match_hidden and name.startswith("."):
+                    continue
+                rel = f"{rel_dir}/{name}" if rel_dir else name
+                if entry.is_symlink():
+                    # Listed if it points inside the sandbox, never followed
+                    is_dir = entry.is_dir()
+                    if (
+                        (is_dir or not dirs_only)
+                        and regex.fullmatch(rel + "/" if is_dir else rel)
+                        and self._stays_in_sandbox(entry.path)
+                    ):
+                        yield rel
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if (is_dir or not dirs_only) and regex.fullmatch(
+                    rel + "/" if is_dir else rel
+                ):
+                    yield rel
+                if is_dir and descend and name not in prune:
+                    stack.append((entry.path, rel, depth + 1))
+
+    def _rg_glob(
+        self,
+        pattern: str,
+        base_dir: Path,
+        prefix: str,
+    ) -> Optional[list[str]]:
+        """
+        Match pattern against the files listed by ``rg --files``.
+        
+        ripgrep walks the tree in parallel, so it is much faster than a
+        Python walk on large projects. --no-ignore keeps .gitignore'd
+        files in the listing, so results match _walk_glob's. rg only
+        lists files, so directories are derived from their parents and
+        directories holding no files are not reported; glob_search only
+        uses it for "**" patterns (the tool description says so).
+        _WALK_PRUNE_DIRS are excluded with --glob, as _walk_glob does not
+        search them.
+        
+        Returns:
+            Matching paths relative to base_dir, or None if rg failed or
+            the pattern could match a directory rg leaves out
+        """
+        dirs_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return []
+        segments = pattern.split("/")
+        prune = _WALK_PRUNE_DIRS.difference(segments)
+        if segments[-1] == "**" or any(
+            _compile_glob(segments[-1]).fullmatch(name + "/") for name in prune
+        ):
+            # rg never lists excluded directories, which _walk_glob reports
+            return None
+        regex = _compile_glob(pattern)
+
+        # No --max-depth: a directory is only found through its files,
+        # which may sit at any depth below it
+        cmd = ["--files", "--no-ignore"]
+        if any(segment.startswith(".") for segment in segments):
+            cmd.append("--hidden")
+        for name in sorted(prune):
+            cmd.extend(["--glob", f"!{name}/"])
+        if prefix:
+            cmd.append(prefix[:-1])
+
+        returncode, lines, _ = self._run_rg(cmd)
+        if returncode not in (0, 1):
+            return None
+
+        # Directories carry a trailing '/', as _compile_glob expects
+        candidates: set[str] = set()
+        for line in lines:
+            entry = line.removeprefix(prefix)
+            parent = entry.rpartition("/")[0]
+            while parent and parent + "/" not in candidates:
+                candidates.add(parent + "/")
+                parent = parent.rpartition("/")[0]
+            if not dirs_only:
+                candidates.add(entry)
+        return [
+            entry.rstrip("/")
+            for entry in candidates
+            if regex.fullmatch(entry)
+            and self._stays_in_sandbox(os.path.join(base_dir, entry.rstrip("/")))
+        ]
+
+    def _stays_in_sandbox(self, full_path: str) -> bool:
+        """Check that a walked entry, if it is a symlink, points inside."""
+        if not os.path.islink(full_path):
+            return True
+        # paranoid: follow the link and make sure it lands in the project
+        try:
+            resolved = os.path.realpath(full_path)
+        except OSError:
+            return False
+        return self._project_relative(resolved) is not None
+
+    def _glob_search_resolved(self, pattern: str, base_dir: Path) -> list[str]:
+        """Glob a pattern that may leave base_dir, keeping in-sandbox hits."""
         matches: list[str] = []
         for entry in glob.iglob(pattern, root_dir=str(base_dir), recursive=True):
-            full_path = (base_dir / entry).resolve()
-            try:
-                rel_path = full_path.relative_to(self.project_dir)
-            except ValueError:
+            matched = self._project_relative(
+                os.path.realpath(os.path.join(base_dir, entry))
+            )
+            if matched is None:
                 # Ignore entries that somehow escape the sandbox
                 continue
-            matched = str(rel_path)
-            if not matched:
-                matched = "."
             matches.append(matched)
-
-        if not matches:
-            return {"result": "No matches found"}
-
-        matches = sorted(set(matches))
-        return {"result": "\n".join(matches)}
+        return matches
 
     def _grep_search(
         self,
@@ -375,9 +1308,10 @@ class ToolExecutor:
         offset: int | None,
         multiline: bool,
     ) -> dict[str, Any]:
-        """Search file contents using ripgrep."""
-        if shutil.which("rg") is None:
-            return {"error": "ripgrep (rg) is not installed"}
+        """Search file contents using ripgrep (or a Python scan without it)."""
+        has_rg = self._rg_path is not None
+        if not has_rg and file_type:
+            return {"error": "'type' requires ripgrep (rg), which is not installed"}
 
         if head_limit is not None and head_limit < 1:
             return {"error": "head_limit must be positive"}
@@ -385,14 +1319,10 @@ class ToolExecutor:
             return {"error": "offset must be zero or positive"}
 
         target_path = self._validate_path(path or ".")
-        relative_target = "."
-        try:
-            relative_target = str(target_path.relative_to(self.project_dir)) or "."
-        except ValueError:
-            # Should not happen due to _validate_path, but guard anyway
-            relative_target = str(target_path)
+        # _validate_path guarantees the target is inside the project
+        relative_target = self._project_relative(str(target_path)) or str(target_path)
 
-        cmd = ["rg", "--color", "never"]
+        cmd: list[str] = []
 
         if glob_pattern:
             cmd.extend(["--glob", glob_pattern])
@@ -406,11 +1336,13 @@ class ToolExecutor:
             if after is not None:
                 cmd.extend(["-A", str(after)])
 
+        show_numbers = False
         effective_mode = output_mode or "files_with_matches"
         if effective_mode not in {"content", "files_with_matches", "count"}:
             return {"error": f"Invalid output_mode: {effective_mode}"}
         if effective_mode == "files_with_matches":
-            cmd.append("-l")
+            # -m1: stop reading each file at its first match
+            cmd.extend(["-l", "-m1"])
         elif effective_mode == "count":
             cmd.append("-c")
         else:
@@ -420,6 +1352,13 @@ class ToolExecutor:
                 show_numbers = True
             if show_numbers:
                 cmd.append("-n")
+            # Long (e.g. minified) lines are shown as a preview, not in full
+            cmd.extend(["--max-columns=512", "--max-columns-preview"])
+            if head_limit:
+                # No file can contribute more matches than the requested
+                # window (+1 so truncation is still detected), so let rg
+                # stop scanning each file there
+                cmd.extend(["--max-count", str((offset or 0) + head_limit + 1)])
 
         if ignore_case:
             cmd.append("-i")
@@ -429,36 +1368,351 @@ class ToolExecutor:
         cmd.append(pattern)
         cmd.append(relative_target)
 
-        result = subprocess.run(
-            cmd,
-            cwd=self.project_dir,
-            capture_output=True,
-            text=True,
-        )
-
-        stdout = result.stdout.strip()
-        stderr = result.stderr.strip()
+        start = max(offset or 0, 0)
+        # One line past the window is enough to know the output was cut
+        max_lines = start + head_limit + 1 if head_limit else None
+        if has_rg:
+            returncode, lines, stderr = self._run_rg(cmd, max_lines)
+        else:
+            returncode, lines, stderr = self._search_content(
+                pattern,
+                target_path,
+                glob_pattern,
+                effective_mode,
+                before=(context if context is not None else before) or 0,
+                after=(context if context is not None else after) or 0,
+                show_numbers=show_numbers,
+                ignore_case=bool(ignore_case),
+                multiline=multiline,
+                max_lines=max_lines,
+            )
 
-        if result.returncode not in (0, 1):
-            return {"error": stderr or f"rg failed with exit code {result.returncode}"}
+        if returncode not in (0, 1):
+            return {"error": stderr or f"rg failed with exit code {returncode}"}
 
-        if result.returncode == 1 and not stdout:
+        if returncode == 1 and not lines:
             return {"result": "No matches found"}
 
-        lines = stdout.splitlines()
-        start = max(offset or 0, 0)
         if start >= len(lines):
             return {"error": "Offset skips all output"}
         end = start + head_limit if head_limit else len(lines)
         sliced = lines[start:end]
         if head_limit and len(lines) > end:
             sliced.append("... (results truncated)")
+        if stderr:
+            # Joined with the matches in one pass instead of a second copy
+            sliced.append(f"[stderr]: {stderr}")
 
         output = "\n".join(sliced)
-        if stderr:
-            output = f"{output}\n[stderr]: {stderr}"
         return {"result": output or "(no output)"}
     
+    def _search_content(
+        self,
+        pattern: str,
+        target_path: Path,
+        glob_pattern: str | None,
+        mode: str,
+        before: int,
+        after: int,
+        show_numbers: bool,
+        ignore_case: bool,
+        multiline: bool,
+        max_lines: int | None,
+    ) -> tuple[int, list[str], str]:
+        """
+        Search file contents in Python, for when ripgrep is not installed.
+        
+        Produces the same output formats as the rg command _grep_search
+        builds. Hidden and _WALK_PRUNE_DIRS directories stand in for
+        .gitignore handling, and files with a NUL byte are skipped as
+        binary.
+        
+        Returns:
+            Tuple of (returncode, output lines, error message), like _run_rg
+        """
+        try:
+            regex = _compile_search_regex(pattern, ignore_case, multiline)
+        except re.error as e:
+            return 2, [], f"regex parse error: {e}"
+        
+        with_filename = target_path.is_dir()
+        # rg prints paths under the search path as given, so searching the
+        # project root (passed to rg as ".") yields "./src/app.py"
+        path_prefix = "./" if str(target_path) == self._project_root else ""
+        with_context = mode == "content" and (before or after)
+        
+        def scan(file_path: str) -> Optional[list[str]]:
+            content = self._read_search_text(file_path)
+            if not content:
+                return None
+            matched = _matching_lines(
+                regex, content, multiline, first_only=mode == "files_with_matches"
+            )
+            if not matched:
+                return None
+            
+            rel_path = path_prefix + file_path[len(self._project_prefix):]
+            if mode == "files_with_matches":
+                return [rel_path]
+            if mode == "count":
+                count = str(len(matched))
+                return [f"{rel_path}:{count}" if with_filename else count]
+            # Only files with matches are split into lines, for output
+            file_lines = content.removesuffix("\n").split("\n")
+            return _format_content_lines(
+                rel_path if with_filename else None,
+                file_lines,
+                matched,
+                before,
+                after,
+                show_numbers,
+            )
+        
+        files = list(self._iter_search_files(target_path, glob_pattern))
+        # Files are scanned a batch at a time so a head_limit cut-off
+        # doesn't leave the whole tree queued on the pool
+        batch_size = _SCAN_WORKERS * 4
+        lines: list[str] = []
+        for batch_start in range(0, len(files), batch_size):
+            batch = files[batch_start:batch_start + batch_size]
+            if len(batch) == 1:
+                results = [scan(batch[0])]
+            else:
+                results = self._scan_executor.map(scan, batch)
+            for file_output in results:
+                if not file_output:
+                    continue
+                if with_context and lines:
+                    lines.append("--")
+                lines.extend(file_output)
+                if max_lines is not None and len(lines) >= max_lines:
+                    return 0, lines, ""
+        
+        return (0 if lines else 1), lines, ""
+    
+    def _iter_search_files(
+        self,
+        target_path: Path,
+        glob_pattern: str | None,
+    ) -> Iterator[str]:
+        """Yield the files _search_content should scan, in sorted order."""
+        if not target_path.is_dir():
+            yield str(target_path)
+            return
+        
+        include = None
+        exclude = False
+        if glob_pattern:
+            # rg --glob: a pattern without '/' matches the file name at any
+            # depth, and a leading '!' excludes instead of includes
+            exclude = glob_pattern.startswith("!")
+            include_pattern = glob_pattern.removeprefix("!").lstrip("/")
+            include = _compile_glob(include_pattern)
+            match_name = "/" not in include_pattern
+        
+        # os.scandir instead of os.walk: DirEntry type checks come from the
+        # directory listing, so skipping symlinks costs no extra lstat()
+        stack = [(str(target_path), "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in _WALK_PRUNE_DIRS:
+                        subdirs.append(entry)
+                    continue
+                if include is not None:
+                    subject = name if match_name else (
+                        f"{rel_dir}/{name}" if rel_dir else name
+                    )
+                    if bool(include.fullmatch(subject)) == exclude:
+                        continue
+                yield entry.path
+            # A directory's files come before its subdirectories, as os.walk
+            stack.extend(
+                (entry.path, f"{rel_dir}/{entry.name}" if rel_dir else entry.name)
+                for entry in reversed(subdirs)
+            )
+    
+    @staticmethod
+    def _read_search_text(file_path: str) -> Optional[str]:
+        """Return a file's text for searching, or None if binary/unreadable."""
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if b"\x00" in data[:_BINARY_SNIFF_MIN_SIZE]:
+            return None
+        text = data.decode("utf-8", errors="replace")
+        return text.replace("\r\n", "\n") if "\r" in text else text
+    
+    def _run_rg(
+        self,
+        args: list[str],
+        max_lines: Optional[int] = None,
+    ) -> tuple[int, list[str], str]:
+        """
+        Run ripgrep with the options shared by every search.
+        
+        Single entry point for grep_search and glob_search, so both go
+        through the same result cache and streaming reader.
+        
+        Args:
+            args: rg arguments, without the executable
+            max_lines: Stop rg once this many output lines have arrived
+        
+        Returns:
+            Tuple of (returncode, stdout lines, stripped stderr)
+        """
+        return self._run_rg_cached(
+            [self._rg_path, "--color", "never", *args], max_lines
+        )
+    
+    def _run_rg_cached(
+        self,
+        cmd: list[str],
+        max_lines: Optional[int] = None,
+    ) -> tuple[int, list[str], str]:
+        """
+        Run an rg command, reusing the output of an identical earlier run.
+        
+        Output is cached before any offset/head_limit slicing, so paging
+        through the same search doesn't re-run rg. A run that was stopped
+        early only satisfies later calls that need no more lines than it
+        collected. Entries are dropped whenever write_file, edit_file or
+        bash runs, keyed on the project directory's mtime to catch
+        top-level changes made outside the executor, and expire after
+        _SEARCH_CACHE_TTL seconds to catch the rest.
+        
+        Args:
+            cmd: Full rg command line
+            max_lines: Stop rg once this many output lines have arrived
+        
+        Returns:
+            Tuple of (returncode, stdout lines, stripped stderr)
+        """
+        key = (tuple(cmd), self._dir_signature())
+        with self._cache_lock:
+            cached = self._cache_lookup(self._grep_cache, key)
+            if cached is not None:
+                returncode, lines, stderr, complete = cached
+                if complete or (max_lines is not None and len(lines) >= max_lines):
+                    return returncode, list(lines), stderr
+        
+        returncode, lines, stderr, complete = self._stream_rg(cmd, max_lines)
+        
+        if returncode in (0, 1) and sum(map(len, lines)) <= _GREP_CACHE_MAX_CHARS:
+            with self._cache_lock:
+                self._cache_store(
+                    self._grep_cache, key, (returncode, tuple(lines), stderr, complete)
+                )
+        return returncode, lines, stderr
+    
+    def _stream_rg(
+        self,
+        cmd: list[str],
+        max_lines: Optional[int],
+    ) -> tuple[int, list[str], str, bool]:
+        """
+        Run rg, reading stdout line by line and stopping it early.
+        
+        Once max_lines lines have arrived rg is terminated instead of being
+        left to finish a search whose remaining output would be discarded.
+        stderr is drained on a helper thread so rg never blocks on a full
+        pipe. Output is read as bytes and decoded once at the end by
+        _decode_output, with undecodable bytes replaced rather than failing
+        the search.
+        
+        Returns:
+            Tuple of (returncode, stdout lines, stripped stderr, complete)
+        """
+        proc = subprocess.Popen(
+            cmd,
+            cwd=self.project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stderr_chunks: list[bytes] = []
+        drain = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()),
+            daemon=True,
+        )
+        drain.start()
+        
+        raw_lines: list[bytes] = []
+        complete = True
+        try:
+            for line in proc.stdout:
+                raw_lines.append(line)
+                if max_lines is not None and len(raw_lines) >= max_lines:
+                    complete = False
+                    proc.terminate()
+                    break
+        finally:
+            proc.stdout.close()
+            try:
+                returncode = proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                returncode = proc.wait()
+            drain.join()
+        
+        if not complete:
+            # Killed on purpose after finding matches
+            returncode = 0
+        text = _decode_output(b"".join(raw_lines)).rstrip("\n")
+        lines = text.split("\n") if text else []
+        stderr = _decode_output(b"".join(stderr_chunks)).strip()
+        return returncode, lines, stderr, complete
+    
+    def _dir_signature(self) -> int:
+        """Cheap change marker for the project root (entries added/removed)."""
+        return os.stat(self.project_dir).st_mtime_ns
+    
+    @staticmethod
+    def _cache_lookup(cache: OrderedDict, key: tuple) -> Any:
+        """
+        Return an unexpired search cache entry, or None.
+        
+        Caller must hold _cache_lock.
+        """
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _cache_store(cache: OrderedDict, key: tuple, value: Any) -> None:
+        """
+        Add a search cache entry for _SEARCH_CACHE_TTL seconds, evicting LRU.
+        
+        Caller must hold _cache_lock.
+        """
+        cache[key] = (time.monotonic() + _SEARCH_CACHE_TTL, value)
+        cache.move_to_end(key)
+        while len(cache) > _GREP_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    
+    def _invalidate_search_caches(self) -> None:
+        """Forget cached search results after the project may have changed."""
+        with self._cache_lock:
+            self._grep_cache.clear()
+            self._glob_cache.clear()
+    
     def _run_bash(self, command: str) -> dict[str, Any]:
         """
         Run a bash command with security validation.
@@ -470,26 +1724,96 @@ class ToolExecutor:
         if not is_allowed:
             return {"error": f"Command blocked: {reason}"}
         
+        argv = _split_simple_command(command)
+        
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=self.project_dir,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-            )
+            if argv is not None:
+                # Plain commands are exec'd directly, skipping /bin/sh
+                try:
+                    result = self._run_process(argv, shell=False)
+                except OSError:
+                    # Not something exec() can start, e.g. a shell builtin
+                    # or a script without a shebang (ENOEXEC), which
+                    # /bin/sh runs itself
+                    argv = None
+            if argv is None:
+                result = self._run_process(command, shell=True)
             
-            output = result.stdout
+            # Assemble once rather than growing a possibly large string
+            parts = [result.stdout]
             if result.stderr:
-                output += f"\n[stderr]: {result.stderr}"
+                parts.append(f"\n[stderr]: {result.stderr}")
             
             if result.returncode != 0:
-                output += f"\n[exit code: {result.returncode}]"
+                parts.append(f"\n[exit code: {result.returncode}]")
             
+            output = "".join(parts)
             return {"result": output if output.strip() else "(no output)"}
             
         except subprocess.TimeoutExpired:
             return {"error": "Command timed out after 5 minutes"}
         except Exception as e:
             return {"error": f"Command execution failed: {str(e)}"}
+        finally:
+            # The command may have changed any file in the project
+            self._invalidate_search_caches()
+
+    
+    def _run_process(
+        self,
+        args: str | list[str],
+        shell: bool,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command in its own process group, capturing its output.
+        
+        On timeout the whole group is killed, not just the direct child, so
+        a shell pipeline's children can't linger and keep the output pipes
+        open. The child starts through the same vfork fast path as
+        subprocess.run; setting a session is compatible with it.
+        
+        Raises:
+            subprocess.TimeoutExpired: If the command runs past 5 minutes
+        """
+        proc = subprocess.Popen(
+            args,
+            shell=shell,
+            cwd=self.project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = proc.communicate(timeout=300)  # 5 minute timeout
+        except BaseException:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.communicate()
+            raise
+        # Bytes are decoded once here instead of through incremental text
+        # wrappers; binary output is shown with replacement characters
+        return subprocess.CompletedProcess(
+            args,
+            proc.returncode,
+            _decode_output(stdout),
+            _decode_output(stderr),
+        )
+
+
+# Dispatch table for the standard tools, keyed by the names in TOOL_DEFINITIONS
+TOOL_HANDLERS: dict[str, Callable[[ToolExecutor, dict], dict[str, Any]]] = {
+    "read_file": ToolExecutor._handle_read_file,
+    "write_file": ToolExecutor._handle_write_file,
+    "edit_file": ToolExecutor._handle_edit_file,
+    "glob_search": ToolExecutor._handle_glob_search,
+    "grep_search": ToolExecutor._handle_grep_search,
+    "bash": ToolExecutor._handle_bash,
+}
+
+if set(TOOL_HANDLERS) != set(get_tool_names()):
+    raise RuntimeError(
+        "TOOL_HANDLERS is out of sync with TOOL_DEFINITIONS: "
+        f"{sorted(set(TOOL_HANDLERS) ^ set(get_tool_names()))}"
+    )
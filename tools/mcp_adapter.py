@@ -11,18 +11,133 @@ This adapter implements the client side of the protocol.
 """
 
 import asyncio
+import atexit
+import base64
+import concurrent.futures
+import functools
 import json
-import subprocess
-import sys
+import mimetypes
+import os
+import shutil
+import tempfile
+from collections import deque
 from typing import Any, Optional
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # optional; speeds up decoding large screenshot responses
+    orjson = None
+
+
+# JSON-RPC messages are encoded to and decoded from bytes
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON, like orjson.dumps."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+
+# Longest JSON-RPC line the stdout reader accepts; responses carrying
+# base64 screenshots run well past asyncio's 64 KiB default
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+# Kernel buffer size requested for the server's stdout pipe (Linux only;
+# the default is 64 KiB), so large responses need fewer reader wake-ups
+_PIPE_SIZE = 1024 * 1024
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", None)
+
+# Queued messages are joined into writes of up to this many bytes
+_WRITE_BATCH_SIZE = 64 * 1024
+
+# Parameters of the MCP initialize request
+_INIT_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "roots": {
+            "listChanged": False
+        }
+    },
+    "clientInfo": {
+        "name": "autonomous-coding-multimodel",
+        "version": "1.0.0"
+    }
+}
+
+# Sent once the server has answered initialize
+_INITIALIZED_NOTIFICATION = _json_dumps({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized",
+    "params": {},
+}) + b"\n"
+
+# Seconds health_check waits for a ping reply
+_PING_TIMEOUT = 5.0
+
+# Recent server stderr lines kept for error messages; each stored line and
+# the text reported from them are capped, since errors reach the model
+_STDERR_TAIL_LINES = 64
+_STDERR_LINE_MAX = 1024
+_STDERR_TAIL_MAX = 4096
+
+# Small pool for the adapter's blocking work (decoding and saving images),
+# instead of the loop's default executor sized for general use
+_IO_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=2,
+    thread_name_prefix="mcp-io",
+)
+atexit.register(_IO_EXECUTOR.shutdown, wait=False)
+
 
 class MCPError(Exception):
     """Error from MCP communication."""
     pass
 
 
+def _block_text(block: dict) -> Optional[str]:
+    """Return the text for one MCP content block, or None to skip it."""
+    block_type = block.get("type")
+    if block_type == "text":
+        return block.get("text", "")
+    if block_type == "image":
+        # For screenshots, return base64 data info
+        return f"[Image: {block.get('mimeType', 'image/png')}]"
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _request_prefix(method: str) -> bytes:
+    """Return the encoded start of a request envelope, up to the id value."""
+    return b'{"jsonrpc":"2.0","method":' + _json_dumps(method) + b',"id":'
+
+
+def _save_image(data: str, mime_type: str, directory: str) -> str:
+    """
+    Decode a base64 image block and write it to a new file in directory.
+    
+    Decoding a full-page screenshot takes long enough to stall an event
+    loop, so callers run this in a worker thread.
+    
+    Returns:
+        Path of the written file
+    """
+    raw = base64.b64decode(data)
+    suffix = mimetypes.guess_extension(mime_type) or ".img"
+    fd, path = tempfile.mkstemp(prefix="mcp-image-", suffix=suffix, dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        f.write(raw)
+    return path
+
+
 class MCPAdapter:
     """
     Adapter to communicate with MCP servers via stdio.
@@ -57,15 +172,35 @@ class MCPAdapter:
         self.args = args
         self.working_dir = working_dir
         self.timeout = timeout
-        self._process: Optional[subprocess.Popen] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._stdout: Optional[asyncio.StreamReader] = None
+        self._stdout_transport: Optional[asyncio.ReadTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._request_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._write_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stderr_tail: deque[bytes] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._cached_tools: Optional[list[dict]] = None
+        self._image_dir: Optional[str] = None  # created on first image
         self._initialized = False
-        self._lock = asyncio.Lock()
     
     @property
     def is_running(self) -> bool:
         """Check if the MCP server process is running."""
-        return self._process is not None and self._process.poll() is None
+        return self._process is not None and self._process.returncode is None
+    
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        The event loop the server's pipes are bound to, once started.
+        
+        Calls from other threads must be scheduled onto this loop, e.g.
+        with asyncio.run_coroutine_threadsafe.
+        """
+        return self._loop
     
     async def start(self) -> None:
         """
@@ -78,36 +213,26 @@ class MCPAdapter:
             return
         
         try:
-            # Start the MCP server process
-            self._process = subprocess.Popen(
-                [self.command] + self.args,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-                cwd=self.working_dir,
-            )
+            # Start the MCP server process; its pipes are read and written
+            # by the event loop directly, with no executor thread per call
+            await self._spawn()
+            self._loop = asyncio.get_running_loop()
+            # stderr must be read continuously: a chatty server that fills
+            # the pipe blocks on its next log write and stops answering
+            self._stderr_tail.clear()
+            self._stderr_task = asyncio.create_task(self._drain_stderr())
+            self._reader_task = asyncio.create_task(self._reader_loop())
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop())
             
             # Send initialize request per MCP protocol
-            response = await self._send_request("initialize", {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "roots": {
-                        "listChanged": False
-                    }
-                },
-                "clientInfo": {
-                    "name": "autonomous-coding-multimodel",
-                    "version": "1.0.0"
-                }
-            })
+            response = await self._send_request("initialize", _INIT_PARAMS)
             
             if "error" in response:
                 raise MCPError(f"MCP initialization failed: {response['error']}")
             
-            # Send initialized notification
-            await self._send_notification("notifications/initialized", {})
+            # Send initialized notification (constant, so pre-encoded)
+            self._write_queue.put_nowait(_INITIALIZED_NOTIFICATION)
             
             self._initialized = True
             
@@ -120,40 +245,112 @@ class MCPAdapter:
             await self.stop()
             raise MCPError(f"Failed to start MCP server: {e}")
     
+    async def _spawn(self) -> None:
+        """Start the server process and set up its stdout reader."""
+        if _F_SETPIPE_SZ is None:
+            self._process = await asyncio.create_subprocess_exec(
+                self.command,
+                *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.working_dir,
+                limit=_STREAM_LIMIT,
+            )
+            self._stdout = self._process.stdout
+            return
+        
+        # Create stdout ourselves so its buffer can be enlarged before the
+        # server starts writing, then attach it to the loop as a stream
+        read_fd, write_fd = os.pipe()
+        stdout_pipe = os.fdopen(read_fd, "rb", buffering=0)
+        try:
+            try:
+                fcntl.fcntl(write_fd, _F_SETPIPE_SZ, _PIPE_SIZE)
+            except OSError:
+                pass  # above /proc/sys/fs/pipe-max-size; keep the default
+            self._process = await asyncio.create_subprocess_exec(
+                self.command,
+                *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=write_fd,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.working_dir,
+                limit=_STREAM_LIMIT,  # applies to stderr here
+            )
+        except BaseException:
+            stdout_pipe.close()
+            raise
+        finally:
+            os.close(write_fd)  # the child holds its own copy
+        
+        self._stdout = asyncio.StreamReader(limit=_STREAM_LIMIT)
+        loop = asyncio.get_running_loop()
+        self._stdout_transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(self._stdout),
+            stdout_pipe,
+        )
+    
     async def stop(self) -> None:
         """Stop the MCP server process gracefully."""
+        for task in (self._writer_task, self._reader_task, self._stderr_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass  # cancelled, or already failed
+        self._reader_task = self._writer_task = self._stderr_task = None
+        
+        if self._stdout_transport:
+            self._stdout_transport.close()
+        self._stdout = self._stdout_transport = None
+        
         if self._process:
             try:
                 # Try graceful shutdown
                 if self._process.stdin:
                     self._process.stdin.close()
-                self._process.terminate()
+                if self._process.returncode is None:
+                    self._process.terminate()
                 
                 # Wait briefly for graceful exit
                 try:
-                    self._process.wait(timeout=2.0)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(self._process.wait(), timeout=2.0)
+                except asyncio.TimeoutError:
                     self._process.kill()
-                    self._process.wait()
+                    await self._process.wait()
             except Exception:
                 pass  # Ignore cleanup errors
             finally:
                 self._process = None
+                self._loop = None
+                self._cached_tools = None
                 self._initialized = False
+        
+        # Saved screenshots only live as long as the server session
+        if self._image_dir:
+            shutil.rmtree(self._image_dir, ignore_errors=True)
+            self._image_dir = None
     
     async def list_tools(self) -> list[dict]:
         """
         List available tools from the MCP server.
         
+        The server's tool list is fixed for the life of the process, so it
+        is fetched once and reused until the adapter is stopped.
+        
         Returns:
             List of tool definitions
         """
-        response = await self._send_request("tools/list", {})
-        
-        if "error" in response:
-            raise MCPError(f"Failed to list tools: {response['error']}")
-        
-        return response.get("result", {}).get("tools", [])
+        if self._cached_tools is None:
+            response = await self._send_request("tools/list", {})
+            
+            if "error" in response:
+                raise MCPError(f"Failed to list tools: {response['error']}")
+            
+            self._cached_tools = response.get("result", {}).get("tools", [])
+        return list(self._cached_tools)
     
     async def call_tool(self, tool_name: str, arguments: dict) -> dict[str, Any]:
         """
@@ -166,15 +363,48 @@ class MCPAdapter:
         Returns:
             Dict with the tool result or error
         """
-        # Remove the mcp__puppeteer__ prefix if present
-        if tool_name.startswith("mcp__puppeteer__"):
-            tool_name = tool_name.replace("mcp__puppeteer__", "")
+        # Remove the mcp__puppeteer__ prefix if present; puppeteer_ names
+        # from the OpenAI tool definitions already match the server's
+        return await self._call_known_tool(
+            tool_name.removeprefix("mcp__puppeteer__"), arguments
+        )
+    
+    async def call_many(self, calls: list[tuple[str, dict]]) -> list[dict[str, Any]]:
+        """
+        Call several independent MCP tools concurrently.
+        
+        The requests are all in flight at once and the reader task routes
+        each response by id, so the batch takes about as long as its
+        slowest call. Only use this for calls that do not depend on each
+        other (e.g. probes after a navigate, not the navigate itself).
+        
+        Args:
+            calls: (tool_name, arguments) pairs, as accepted by call_tool
+        
+        Returns:
+            The call_tool results, in the same order as calls
+        """
+        if not hasattr(asyncio, "TaskGroup"):
+            # Python < 3.11; call_tool reports failures as error dicts,
+            # so gather never has an exception to propagate
+            return list(await asyncio.gather(
+                *(self.call_tool(name, arguments) for name, arguments in calls)
+            ))
         
-        # Also handle the puppeteer_ prefix used in OpenAI tool definitions
-        if tool_name.startswith("puppeteer_"):
-            # Keep as-is - this matches the MCP server's tool names
-            pass
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(self.call_tool(name, arguments))
+                for name, arguments in calls
+            ]
+        return [task.result() for task in tasks]
+    
+    async def _call_known_tool(self, tool_name: str, arguments: dict) -> dict[str, Any]:
+        """
+        Call an MCP tool by its exact server-side name.
         
+        Same as call_tool without the name normalization, for callers
+        that pass fixed names (the PuppeteerMCPAdapter helpers).
+        """
         try:
             response = await self._send_request("tools/call", {
                 "name": tool_name,
@@ -188,23 +418,43 @@ class MCPAdapter:
             
             # MCP returns content as a list of content blocks
             content = result.get("content", [])
+            if len(content) == 1 and content[0].get("type") == "text":
+                # The usual response: one text block, used as-is
+                return {"result": content[0].get("text", "")}
             if content:
-                # Extract text content
-                text_parts = []
+                texts = []
                 for block in content:
-                    if block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
-                    elif block.get("type") == "image":
-                        # For screenshots, return base64 data info
-                        text_parts.append(f"[Image: {block.get('mimeType', 'image/png')}]")
-                
-                return {"result": "\n".join(text_parts)}
+                    if block.get("type") == "image" and block.get("data"):
+                        texts.append(await self._save_image_block(block))
+                        continue
+                    text = _block_text(block)
+                    if text is not None:
+                        texts.append(text)
+                return {"result": "\n".join(texts)}
             
             return {"result": str(result)}
             
         except Exception as e:
             return {"error": f"MCP communication failed: {str(e)}"}
     
+    async def _save_image_block(self, block: dict) -> str:
+        """
+        Save an image content block to disk and describe where it went.
+        
+        Images go to a temporary directory owned by this adapter, which
+        stop() removes, so screenshots don't pile up over long sessions.
+        """
+        mime_type = block.get("mimeType", "image/png")
+        try:
+            if self._image_dir is None:
+                self._image_dir = tempfile.mkdtemp(prefix="mcp-images-")
+            path = await asyncio.get_running_loop().run_in_executor(
+                _IO_EXECUTOR, _save_image, block["data"], mime_type, self._image_dir
+            )
+        except (ValueError, OSError):
+            return f"[Image: {mime_type}]"  # undecodable or unwritable
+        return f"[Image saved: {path}]"
+    
     async def health_check(self) -> bool:
         """
         Check if the MCP server is responsive.
@@ -212,71 +462,173 @@ class MCPAdapter:
         Returns:
             True if healthy, False otherwise
         """
-        if not self.is_running:
+        if not self.is_running or self._reader_task is None or self._reader_task.done():
             return False
+        return await self.ping()
+    
+    async def ping(self, timeout: float = _PING_TIMEOUT) -> bool:
+        """
+        Send an MCP ping and wait for the empty reply.
+        
+        Much cheaper than a tools/list round trip, which makes the server
+        serialize its whole tool manifest.
         
+        Args:
+            timeout: Seconds to wait for the reply
+            
+        Returns:
+            True if the server answered in time, False otherwise
+        """
         try:
-            # Try listing tools as a health check
-            await self.list_tools()
-            return True
+            response = await self._send_request("ping", {}, timeout=timeout)
         except Exception:
             return False
+        return "error" not in response
     
-    async def _send_request(self, method: str, params: dict) -> dict:
+    async def _send_request(
+        self,
+        method: str,
+        params: dict,
+        timeout: Optional[float] = None,
+    ) -> dict:
         """
         Send a JSON-RPC request and wait for response.
         
+        The response is matched to the request by id in _reader_loop, so
+        concurrent requests are pipelined rather than waiting in turn.
+        
         Args:
             method: RPC method name
             params: Method parameters
+            timeout: Seconds to wait for the response (default: self.timeout)
             
         Returns:
             Response dict
         """
-        async with self._lock:
-            if not self._process or not self._process.stdin or not self._process.stdout:
-                raise MCPError("MCP server not running")
-            
-            self._request_id += 1
-            request = {
-                "jsonrpc": "2.0",
-                "id": self._request_id,
-                "method": method,
-                "params": params
-            }
-            
-            request_line = json.dumps(request) + "\n"
-            
-            # Write request to stdin
-            try:
-                self._process.stdin.write(request_line)
-                self._process.stdin.flush()
-            except BrokenPipeError:
-                raise MCPError("MCP server connection broken")
-            
-            # Read response from stdout with timeout
+        if (
+            not self._process
+            or not self._process.stdin
+            or self._reader_task is None
+            or self._reader_task.done()
+            or self._writer_task is None
+            or self._writer_task.done()
+        ):
+            raise MCPError("MCP server not running")
+        
+        self._request_id += 1
+        request_id = self._request_id
+        request_line = b"".join((
+            _request_prefix(method),
+            str(request_id).encode(),
+            b',"params":',
+            _json_dumps(params),
+            b"}\n",
+        ))
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._write_queue.put_nowait(request_line)
+        try:
             try:
-                response_line = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None, self._process.stdout.readline
-                    ),
-                    timeout=self.timeout
-                )
+                if timeout is None:
+                    timeout = self.timeout
+                return await asyncio.wait_for(future, timeout=timeout)
             except asyncio.TimeoutError:
-                raise MCPError(f"MCP request timed out after {self.timeout}s")
-            
-            if not response_line:
-                # Check for errors in stderr
-                if self._process.stderr:
-                    stderr = self._process.stderr.read()
-                    if stderr:
-                        raise MCPError(f"MCP server error: {stderr}")
-                raise MCPError("MCP server closed connection")
+                raise MCPError(f"MCP request timed out after {timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def _reader_loop(self) -> None:
+        """
+        Read responses from the server and resolve the matching requests.
+        
+        Runs for the life of the process. When stdout closes, every
+        request still waiting fails with the server's error output.
+        """
+        stdout = self._stdout
+        error = MCPError("MCP server closed connection")
+        try:
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                try:
+                    # Both decoders take the raw line, trailing newline
+                    # included, so no strip or decode copy is made
+                    message = _json_loads(line)
+                except ValueError:  # json and orjson decode errors
+                    continue  # not a JSON-RPC message, e.g. stray log output
+                if not isinstance(message, dict):
+                    continue
+                if "method" in message:
+                    # A server-initiated request or notification; a request's
+                    # id is the server's own and may equal a pending one
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
             
+            # Check for errors in stderr, giving the drain a moment to
+            # collect what the exiting server wrote last
+            if self._stderr_task is not None:
+                await asyncio.wait({self._stderr_task}, timeout=1.0)
+            if self._stderr_tail:
+                stderr = b"".join(self._stderr_tail)[-_STDERR_TAIL_MAX:]
+                stderr = stderr.decode(errors="replace")
+                error = MCPError(f"MCP server error: {stderr}")
+        except asyncio.CancelledError:
+            error = MCPError("MCP server stopped")
+            raise
+        except Exception as e:
+            error = MCPError(f"Failed to read from MCP server: {e}")
+        finally:
+            self._fail_pending(error)
+    
+    async def _drain_stderr(self) -> None:
+        """Read the server's stderr as it arrives, keeping the last lines."""
+        stderr = self._process.stderr
+        while True:
             try:
-                return json.loads(response_line)
-            except json.JSONDecodeError as e:
-                raise MCPError(f"Invalid JSON response from MCP server: {e}")
+                line = await stderr.readline()
+            except ValueError:
+                continue  # over the line limit; the buffered part is dropped
+            if not line:
+                break
+            if len(line) > _STDERR_LINE_MAX:
+                line = line[:_STDERR_LINE_MAX] + b" [... line truncated]\n"
+            self._stderr_tail.append(line)
+    
+    async def _writer_loop(self) -> None:
+        """
+        Write queued messages to the server's stdin.
+        
+        This task is the only writer, so messages never interleave and no
+        lock is needed. Messages queued by the time a write starts are
+        joined into one buffer (up to _WRITE_BATCH_SIZE), so a burst of
+        small requests costs one write() syscall and one drain().
+        """
+        stdin = self._process.stdin
+        queue = self._write_queue
+        try:
+            while True:
+                data = await queue.get()
+                if not queue.empty():
+                    batch = bytearray(data)
+                    while len(batch) < _WRITE_BATCH_SIZE and not queue.empty():
+                        batch += queue.get_nowait()
+                    data = batch
+                stdin.write(data)
+                await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            self._fail_pending(MCPError("MCP server connection broken"))
+    
+    def _fail_pending(self, error: MCPError) -> None:
+        """Fail every request still waiting for a response."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
     
     async def _send_notification(self, method: str, params: dict) -> None:
         """
@@ -286,23 +638,17 @@ class MCPAdapter:
             method: RPC method name
             params: Method parameters
         """
-        async with self._lock:
-            if not self._process or not self._process.stdin:
-                raise MCPError("MCP server not running")
-            
-            notification = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params
-            }
-            
-            notification_line = json.dumps(notification) + "\n"
-            
-            try:
-                self._process.stdin.write(notification_line)
-                self._process.stdin.flush()
-            except BrokenPipeError:
-                raise MCPError("MCP server connection broken")
+        if not self._process or self._writer_task is None or self._writer_task.done():
+            raise MCPError("MCP server not running")
+        
+        notification = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params
+        }
+        
+        notification_line = _json_dumps(notification) + b"\n"
+        self._write_queue.put_nowait(notification_line)
     
     async def __aenter__(self) -> "MCPAdapter":
         """Async context manager entry."""
@@ -361,11 +707,11 @@ class PuppeteerMCPAdapter(MCPAdapter):
         if debug_port != 9222:
             args["debugPort"] = debug_port
         
-        return await self.call_tool("puppeteer_connect_active_tab", args)
+        return await self._call_known_tool("puppeteer_connect_active_tab", args)
     
     async def navigate(self, url: str) -> dict[str, Any]:
         """Navigate to a URL."""
-        return await self.call_tool("puppeteer_navigate", {"url": url})
+        return await self._call_known_tool("puppeteer_navigate", {"url": url})
     
     async def screenshot(
         self,
@@ -382,30 +728,30 @@ class PuppeteerMCPAdapter(MCPAdapter):
             args["width"] = width
         if height:
             args["height"] = height
-        return await self.call_tool("puppeteer_screenshot", args)
+        return await self._call_known_tool("puppeteer_screenshot", args)
     
     async def click(self, selector: str) -> dict[str, Any]:
         """Click an element."""
-        return await self.call_tool("puppeteer_click", {"selector": selector})
+        return await self._call_known_tool("puppeteer_click", {"selector": selector})
     
     async def fill(self, selector: str, value: str) -> dict[str, Any]:
         """Fill an input field."""
-        return await self.call_tool("puppeteer_fill", {
+        return await self._call_known_tool("puppeteer_fill", {
             "selector": selector,
             "value": value
         })
     
     async def select(self, selector: str, value: str) -> dict[str, Any]:
         """Select a dropdown option."""
-        return await self.call_tool("puppeteer_select", {
+        return await self._call_known_tool("puppeteer_select", {
             "selector": selector,
             "value": value
         })
     
     async def hover(self, selector: str) -> dict[str, Any]:
         """Hover over an element."""
-        return await self.call_tool("puppeteer_hover", {"selector": selector})
+        return await self._call_known_tool("puppeteer_hover", {"selector": selector})
     
     async def evaluate(self, script: str) -> dict[str, Any]:
         """Execute JavaScript in the browser."""
-        return await self.call_tool("puppeteer_evaluate", {"script": script})
+        return await self._call_known_tool("puppeteer_evaluate", {"script": script})
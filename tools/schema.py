@@ -0,0 +1,93 @@
+"""
+Schema Helpers for Tool Definitions
+===================================
+
+Utilities that work on the JSON-schema ``parameters`` blocks attached to
+each tool definition.
+"""
+
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+
+# Validator signature: returns None when arguments are valid, else a message
+Validator = Callable[[dict], Optional[str]]
+
+# Python type checks for the JSON-schema types used by our tool definitions
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+}
+
+
+def compile_validator(parameters: dict) -> Validator:
+    """
+    Compile a tool's ``parameters`` schema into an argument validator.
+
+    All schema lookups happen here, once, so validating a call is a single
+    pass over the declared properties. Only the keywords our definitions
+    use are supported: ``type``, ``required``, ``enum`` and ``minimum``.
+    A value of None is treated as "not provided", matching how the
+    executor reads optional arguments.
+
+    Args:
+        parameters: The ``parameters`` block of a tool definition
+
+    Returns:
+        Callable returning None for valid arguments, or an error message
+    """
+    required = tuple(parameters.get("required", ()))
+    checks = tuple(
+        (
+            name,
+            spec.get("type"),
+            _TYPE_CHECKS.get(spec.get("type")),
+            frozenset(spec["enum"]) if "enum" in spec else None,
+            spec.get("minimum"),
+        )
+        for name, spec in parameters.get("properties", {}).items()
+    )
+
+    def validate(arguments: dict) -> Optional[str]:
+        if not isinstance(arguments, dict):
+            return "arguments must be an object"
+        for name in required:
+            if arguments.get(name) is None:
+                return f"missing required argument '{name}'"
+        for name, type_name, type_check, enum, minimum in checks:
+            value = arguments.get(name)
+            if value is None:
+                continue
+            if type_check is not None and not type_check(value):
+                return f"'{name}' must be of type {type_name}"
+            if enum is not None and value not in enum:
+                return f"'{name}' must be one of {sorted(enum)}"
+            if minimum is not None and value < minimum:
+                return f"'{name}' must be >= {minimum}"
+        return None
+
+    return validate
+
+
+def freeze(value: Any) -> Any:
+    """
+    Return a deeply read-only view of a JSON-like value.
+
+    Dicts become MappingProxyType views and lists become tuples, so the
+    result can be shared between callers without a defensive deepcopy.
+
+    Args:
+        value: A dict/list/scalar structure such as a tool definition
+
+    Returns:
+        The frozen equivalent of ``value``
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
@@ -4,68 +4,75 @@ SDK-based Tool Definitions using OpenAI Agents SDK
 
 These tools use the @function_tool decorator for automatic schema generation.
 They wrap the existing ToolExecutor for backward compatibility.
+
+The decorator (and the Agents SDK import) is applied on the first call to
+get_sdk_tools(), so importing this module stays cheap.
 """
 
-from typing import Annotated, Optional
+from typing import Annotated, Any, Callable, Optional
 from pathlib import Path
 
-from agents import function_tool
-
-from security import validate_bash_command
 from .executor import ToolExecutor
 
 
-# Global executor instance (set by provider)
-_executor: Optional[ToolExecutor] = None
+# Bound execute method of the global executor (set by provider), so each
+# tool call is one global load instead of a global plus attribute lookup
+_execute: Optional[Callable[[str, dict], dict[str, Any]]] = None
+
+# Returned by every tool when called before set_executor
+_NOT_INITIALIZED = "Error: Tool executor not initialized"
 
 
 def set_executor(executor: ToolExecutor) -> None:
     """Set the global tool executor instance."""
-    global _executor
-    _executor = executor
+    global _execute
+    _execute = executor.execute
+
+
+def _drop_none(arguments: dict) -> dict:
+    """Drop unset optional arguments; the executor applies its defaults."""
+    return {key: value for key, value in arguments.items() if value is not None}
+
+
+def _result_text(result: dict) -> str:
+    """Convert an executor result dict into the string returned to the SDK."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+    return result.get("result", "")
 
 
-@function_tool
 def read_file(
     path: Annotated[str, "Relative path to the file (within the project directory)"],
     offset: Annotated[Optional[int], "Optional 0-based line number to start reading from"] = 0,
     limit: Annotated[Optional[int], "Optional number of lines to read starting at offset"] = None,
 ) -> str:
     """Read the contents of a file. Supports optional offset/limit to page through very large files."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    result = _executor.execute("read_file", {
+    result = _execute("read_file", _drop_none({
         "path": path,
         "offset": offset,
         "limit": limit,
-    })
-    
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    }))
+    return _result_text(result)
 
 
-@function_tool
 def write_file(
     path: Annotated[str, "Relative path to the file (within the project directory)"],
     content: Annotated[str, "Content to write"],
 ) -> str:
     """Write content to a file. Creates parents if needed and overwrites the entire file."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    result = _executor.execute("write_file", {
+    result = _execute("write_file", {
         "path": path,
         "content": content,
     })
-    
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    return _result_text(result)
 
 
-@function_tool
 def edit_file(
     path: Annotated[str, "Relative path to the file"],
     old_string: Annotated[str, "Exact text to replace"],
@@ -73,41 +80,33 @@ def edit_file(
     replace_all: Annotated[Optional[bool], "Set true to replace every occurrence (default replaces first only)"] = False,
 ) -> str:
     """Replace existing text within a file. The target string must exist; set replace_all true to update every occurrence."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    result = _executor.execute("edit_file", {
+    result = _execute("edit_file", _drop_none({
         "path": path,
         "old_string": old_string,
         "new_string": new_string,
         "replace_all": replace_all,
-    })
-    
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    }))
+    return _result_text(result)
 
 
-@function_tool
 def glob_search(
     pattern: Annotated[str, "Glob pattern (supports ** for recursion)"],
     path: Annotated[Optional[str], "Optional directory to scope the search (defaults to project root)"] = None,
 ) -> str:
-    """List files or directories matching a glob pattern within the sandbox."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
+    """List files or directories matching a glob pattern within the sandbox. Hidden entries are skipped unless a pattern segment starts with '.', and the directories .git, node_modules, __pycache__, .venv, venv, dist, build, .next, .tox and target are listed but not searched unless a pattern segment names them (e.g. 'build/**/*.py'). .gitignore is not applied. Directories that contain no files may be omitted from '**' matches when ripgrep (rg) is installed."""
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    result = _executor.execute("glob_search", {
+    result = _execute("glob_search", _drop_none({
         "pattern": pattern,
         "path": path,
-    })
-    
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    }))
+    return _result_text(result)
 
 
-@function_tool
 def grep_search(
     pattern: Annotated[str, "Regex or literal pattern to search for"],
     path: Annotated[Optional[str], "File or directory to search (default '.')"] = None,
@@ -124,16 +123,17 @@ def grep_search(
     multiline: Annotated[Optional[bool], "Enable multiline dotall mode (rg -U --multiline-dotall)"] = None,
 ) -> str:
     """Search file contents using ripgrep-compatible options. Supports line context, glob/type filters, and output throttling."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    # Map parameter names to executor format
-    args = {
+    # Map parameter names to executor format; unset options (including an
+    # empty output_mode or false multiline) fall back to executor defaults
+    args = _drop_none({
         "pattern": pattern,
         "path": path,
         "glob": glob,
         "type": type,
-        "output_mode": output_mode or "files_with_matches",
+        "output_mode": output_mode or None,
         "-B": before,
         "-A": after,
         "-C": context,
@@ -141,46 +141,59 @@ def grep_search(
         "-i": ignore_case,
         "head_limit": head_limit,
         "offset": offset,
-        "multiline": multiline or False,
-    }
-    
-    result = _executor.execute("grep_search", args)
+        "multiline": multiline or None,
+    })
     
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    result = _execute("grep_search", args)
+    return _result_text(result)
 
 
-@function_tool
 def bash(
     command: Annotated[str, "Command to run (e.g. 'npm install', 'git status')"],
 ) -> str:
     """Execute a bash command from the project root. Commands are validated against the same allowlist used by the Claude CLI demo."""
-    if not _executor:
-        return "Error: Tool executor not initialized"
-    
-    # Validate command first
-    is_allowed, reason = validate_bash_command(command)
-    if not is_allowed:
-        return f"Error: Command blocked: {reason}"
+    if _execute is None:
+        return _NOT_INITIALIZED
     
-    result = _executor.execute("bash", {
+    # The executor validates the command against the allowlist
+    result = _execute("bash", {
         "command": command,
     })
-    
-    if "error" in result:
-        return f"Error: {result['error']}"
-    return result.get("result", "")
+    return _result_text(result)
 
 
-# Export all tools as a list
-SDK_TOOLS = [
+# The plain tool functions, in the order they are exported
+_TOOL_FUNCTIONS = (
     read_file,
     write_file,
     edit_file,
     glob_search,
     grep_search,
     bash,
-]
+)
+
+_sdk_tools: Optional[list] = None
+
+
+def get_sdk_tools() -> list:
+    """
+    Return all tools wrapped with @function_tool, building them once.
+    
+    Wrapping inspects each signature and generates its JSON schema, so it
+    is deferred until a provider actually needs the tools.
+    """
+    global _sdk_tools
+    if _sdk_tools is None:
+        from agents import function_tool
+        
+        _sdk_tools = [function_tool(func) for func in _TOOL_FUNCTIONS]
+    return _sdk_tools
+
+
+def __getattr__(name: str):
+    # SDK_TOOLS is kept as a lazily built module attribute (PEP 562)
+    if name == "SDK_TOOLS":
+        return get_sdk_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 